@@ -1,13 +1,31 @@
 import tkinter as tk
 from tkinter import messagebox
 import random
+import argparse
+from pathlib import Path
+from quiz_stats import ResponseTimeTracker
+from quiz_adaptive import AdaptiveDifficulty
+from quiz_results import ResultsStore
+from quiz_operators import DIFFICULTY_RANGES
+from quiz_questions import QuestionPicker, write_history
+from exam_server import ExamClient
+from quiz_export import MarksExporter, valid_student_number
+from stall_monitor import StallMonitor
+from profiler_toggle import ProfilerToggle
+from tk_asyncio import TkAsyncio
+from session_replay import record_from_env, save_from_env
+
+# Per-session timing exports and the results store live next to this script
+SESSIONS_DIR = Path(__file__).resolve().parent / "quiz_sessions"
+RESULTS_DIR = Path(__file__).resolve().parent / "quiz_results"
+QUESTION_HISTORY = "question_history.json"
 
 class MathsQuiz:
-    def __init__(self):
+    def __init__(self, exam = None, remember_questions = False):
         self.window = tk.Tk()
         self.window.title("Maths Quiz")
         self.window.configure(bg = '#ffe6f2')
-        self.window.geometry("500x400")
+        self.window.geometry("500x560")
 
         # Styling
         self.title_font = ("Comic Sans MS", 16, "bold")
@@ -18,7 +36,26 @@ class MathsQuiz:
         self.current_question = 0
         self.total_questions = 10
         self.difficulty = None
-        self.attemps = 0
+        self.attempts = 0
+        self.feedback_job = None
+        self.timings = ResponseTimeTracker()
+        self.adaptive = AdaptiveDifficulty()
+        self.tier = None
+        self.question = None
+        self.answer = None
+        self.student = "guest"
+        self.results = ResultsStore(RESULTS_DIR)
+        # No question repeats in a session (or, optionally, for a student at all)
+        self.questions = QuestionPicker(RESULTS_DIR / QUESTION_HISTORY if remember_questions else None)
+        # Networked mode: questions and marking come from the exam server
+        self.exam = exam
+        self.exam_question = None
+        self.waiting_for_server = False
+        # Scores are exported in batches to quiz_marks.txt (studentMarks format)
+        self.student_number = None
+        self.exporter = MarksExporter()
+        # Background work (file locks, network) runs without blocking the window
+        self.tasks = TkAsyncio(self.window)
 
         self.setup_widgets()
         self.displayMenu()
@@ -58,19 +95,28 @@ class MathsQuiz:
             )
         self.question_label.pack(pady = 10)
 
+        # Quiz view: answer entry, submit button, score and feedback.
+        # Built once and shown/hidden as a whole on every replay.
+        self.quiz_frame = tk.Frame(
+            self.main_frame, 
+            bg = '#ffe6f2'
+            )
+
         # Answer entry
         self.answer_entry = tk.Entry(
-            self.main_frame, 
+            self.quiz_frame, 
             font = self.normal_font, 
             bg = '#fff0f5', 
             fg = '#8b008b', 
             width = 20
             )
         self.answer_entry.pack(pady = 10)
+        # Enter submits, so answering never needs the mouse
+        self.answer_entry.bind("<Return>", lambda event: self.check_answer())
 
         # Submit button
         self.submit_btn = tk.Button(
-            self.main_frame, 
+            self.quiz_frame, 
             text = "Submit Answer", 
             font = self.button_font, 
             bg = '#ff69b4', 
@@ -82,7 +128,7 @@ class MathsQuiz:
 
         # Score label
         self.score_label = tk.Label(
-            self.main_frame, 
+            self.quiz_frame, 
             text = "Score: 0", 
             font = self.normal_font, 
             bg = '#ffe6f2', 
@@ -90,23 +136,76 @@ class MathsQuiz:
             )
         self.score_label.pack(pady = 10)
 
-        # Difficulty buttons frame
-        self.diff_frame = tk.Frame(
+        # Inline feedback label (replaces the modal message boxes)
+        self.feedback_label = tk.Label(
+            self.quiz_frame, 
+            text = "", 
+            font = self.normal_font, 
+            bg = '#ffe6f2', 
+            fg = '#8b008b'
+            )
+        self.feedback_label.pack(pady = 5)
+
+        # Menu view: student name and difficulty buttons, also built once
+        self.menu_frame = tk.Frame(
             self.main_frame, 
             bg = '#ffe6f2'
             )
-        
-    def displayMenu(self):
-        self.question_label.config(text = "DIFFICULTY LEVEL")
 
-        # Remove existing widgets from diff_frame
-        for widget in self.diff_frame.winfo_children():
-            widget.destroy()
+        # Student name (kept between replays)
+        self.name_frame = tk.Frame(
+            self.menu_frame, 
+            bg = '#ffe6f2'
+            )
+        self.name_frame.pack(pady = (10, 0))
+        tk.Label(
+            self.name_frame, 
+            text = "Your name:", 
+            font = self.normal_font, 
+            bg = '#ffe6f2', 
+            fg = '#c71585'
+            ).pack(side = 'left', padx = 5)
+        self.name_entry = tk.Entry(
+            self.name_frame, 
+            font = self.normal_font, 
+            bg = '#fff0f5', 
+            fg = '#8b008b', 
+            width = 15
+            )
+        self.name_entry.pack(side = 'left')
+
+        # Optional student code, needed to export the score to the marks file
+        self.number_frame = tk.Frame(
+            self.menu_frame, 
+            bg = '#ffe6f2'
+            )
+        self.number_frame.pack(pady = (5, 0))
+        tk.Label(
+            self.number_frame, 
+            text = "Student no.:", 
+            font = self.normal_font, 
+            bg = '#ffe6f2', 
+            fg = '#c71585'
+            ).pack(side = 'left', padx = 5)
+        self.number_entry = tk.Entry(
+            self.number_frame, 
+            font = self.normal_font, 
+            bg = '#fff0f5', 
+            fg = '#8b008b', 
+            width = 15
+            )
+        self.number_entry.pack(side = 'left')
 
+        # Difficulty buttons frame
+        self.diff_frame = tk.Frame(
+            self.menu_frame, 
+            bg = '#ffe6f2'
+            )
         self.diff_frame.pack(pady = 20)
 
         # Difficulty buttons
-        easy_btn = tk.Button(
+        self.difficulty_buttons = {}
+        self.difficulty_buttons['easy'] = tk.Button(
             self.diff_frame, 
             text = "₊˚⊹ 1. Easy", 
             font = self.button_font, 
@@ -114,9 +213,9 @@ class MathsQuiz:
             fg = '#8b008b', 
             command = lambda: self.set_difficulty("easy")
             )
-        easy_btn.pack(pady = 5, fill = 'x')
+        self.difficulty_buttons['easy'].pack(pady = 5, fill = 'x')
 
-        moderate_btn = tk.Button(
+        self.difficulty_buttons['moderate'] = tk.Button(
             self.diff_frame, 
             text = "⋆˚࿔ 2. Moderate", 
             font = self.button_font, 
@@ -124,9 +223,9 @@ class MathsQuiz:
             fg = '#8b008b', 
             command = lambda: self.set_difficulty("moderate")
             )
-        moderate_btn.pack(pady = 5, fill = 'x')
+        self.difficulty_buttons['moderate'].pack(pady = 5, fill = 'x')
 
-        advanced_btn = tk.Button(
+        self.difficulty_buttons['advanced'] = tk.Button(
             self.diff_frame, 
             text = "ᰔ 3. Advanced", 
             font = self.button_font, 
@@ -134,80 +233,196 @@ class MathsQuiz:
             fg = '#8b008b', 
             command = lambda: self.set_difficulty("advanced")
             )
-        advanced_btn.pack(pady = 5, fill = 'x')
+        self.difficulty_buttons['advanced'].pack(pady = 5, fill = 'x')
+
+        self.difficulty_buttons['adaptive'] = tk.Button(
+            self.diff_frame, 
+            text = "⊹ 4. Adaptive", 
+            font = self.button_font, 
+            bg = '#db7093', 
+            fg = '#8b008b', 
+            command = lambda: self.set_difficulty("adaptive")
+            )
+        # Exam servers only set fixed-difficulty exams
+        if self.exam is None:
+            self.difficulty_buttons['adaptive'].pack(pady = 5, fill = 'x')
 
-        # Hide submit button and entry in menu
-        self.answer_entry.pack_forget()
-        self.submit_btn.pack_forget()
-        self.score_label.pack_forget()
+    def displayMenu(self):
+        self.question_label.config(text = "DIFFICULTY LEVEL")
+
+        # Swap the quiz view for the menu view
+        self.clear_feedback()
+        self.quiz_frame.pack_forget()
+        self.menu_frame.pack()
 
     def set_difficulty(self, level):
+        self.student = self.name_entry.get().strip() or "guest"
+        number_text = self.number_entry.get().strip()
+        self.student_number = valid_student_number(number_text)
+        if number_text and self.student_number is None:
+            messagebox.showerror("Student number ૮ ․ ․ ྀིა", "Student numbers are between 1000 and 9999")
+            return
+
+        if self.exam is not None:
+            # The round trip runs on a worker thread; the menu stays
+            # disabled until the server replies
+            self.set_menu_enabled(False)
+            self.tasks.submit(
+                self.tasks.run_blocking(self.exam.start, self.student, level),
+                callback = lambda reply: self.start_exam(level, reply),
+                errback = self.exam_start_failed
+                )
+            return
+        self.start_quiz(level)
+
+    def set_menu_enabled(self, enabled):
+        state = 'normal' if enabled else 'disabled'
+        for button in self.difficulty_buttons.values():
+            button.config(state = state)
+
+    def start_exam(self, level, reply):
+        self.set_menu_enabled(True)
+        self.total_questions = reply['total']
+        self.exam_question = reply['question']
+        self.start_quiz(level)
+
+    def exam_start_failed(self, error):
+        self.set_menu_enabled(True)
+        messagebox.showerror("Exam server ૮ ․ ․ ྀིა", f"Could not start the exam: {error}")
+
+    def start_quiz(self, level):
         self.difficulty = level
-        self.diff_frame.pack_forget()
-        self.answer_entry.pack(pady = 10)
-        self.submit_btn.pack(pady = 10)
-        self.score_label.pack(pady = 10)
-        self.next_question()
+        self.adaptive.select_student(self.student)
+        self.questions.select_student(self.student)
+        self.menu_frame.pack_forget()
+        self.quiz_frame.pack()
+        self.answer_entry.focus_set()
+        self.timings.new_session(level)
+        self.score_label.config(text = f"Score: {self.score}")
+        self.displayProblem()
 
-    def randomInt(self):
-        if self.difficulty == "easy":
-            return random.randint(0, 9)
-        elif self.difficulty == "moderate":
-            return random.randint(10, 99)
-        else:  # advanced
-            return random.randint(1000, 9999)
+    def numberRange(self):
+        if self.difficulty == "adaptive":
+            return self.tier[0], self.tier[1]
+        return DIFFICULTY_RANGES[self.difficulty]
 
     def decideOperation(self):
+        if self.difficulty == "adaptive":
+            return random.choice(self.tier[2])
         return '+' if random.randint(0, 1) == 0 else '-'
 
     def displayProblem(self):
-        self.num1 = self.randomInt()
-        self.num2 = self.randomInt()
-        self.operation = self.decideOperation()
-
-        # Make sure we don't get negative results for subtraction
-        if self.operation == '-' and self.num1 < self.num2:
-            self.num1, self.num2 = self.num2, self.num1
-
-        question_text = f"Question {self.current_question + 1}: {self.num1} {self.operation} {self.num2} = ?"
+        if self.exam is not None:
+            # The server keeps the answer; we only show its question
+            self.question, self.answer = self.exam_question['text'], None
+        elif self.difficulty == "adaptive":
+            # Tier is picked per question from the running skill estimate
+            self.tier = self.adaptive.next_tier()
+        if self.exam is None:
+            self.operation = self.decideOperation()
+            # Drawn from the questions this student has not had yet; the
+            # operator builds the text and works out the answer up front
+            self.question, self.answer = self.questions.next(self.operation, *self.numberRange())
+
+        question_text = f"Question {self.current_question + 1}: {self.question} = ?"
+        if self.difficulty == "adaptive":
+            question_text += f"\n(Level {self.adaptive.level()})"
         self.question_label.config(text = question_text)
         self.answer_entry.delete(0, tk.END)
-        self.attemps = 0
+        self.attempts = 0
+        self.timings.question_shown()
 
     def isCorrect(self, user_answer):
         try:
-            if self.operation == '+':
-                correct_answer = self.num1 + self.num2
-            else:
-                correct_answer = self.num1 - self.num2
-            return int(user_answer) == correct_answer
+            return int(user_answer) == self.answer
         except ValueError:
             return False
 
+    def show_feedback(self, text, colour, delay = 1500):
+        # Show a message under the score and clear it after `delay` ms
+        if self.feedback_job is not None:
+            self.window.after_cancel(self.feedback_job)
+        self.feedback_label.config(text = text, fg = colour)
+        self.feedback_job = self.window.after(delay, self.clear_feedback)
+
+    def clear_feedback(self):
+        if self.feedback_job is not None:
+            self.window.after_cancel(self.feedback_job)
+            self.feedback_job = None
+        self.feedback_label.config(text = "")
+
     def check_answer(self):
         user_answer = self.answer_entry.get()
 
+        # Ignore empty submissions (e.g. Enter pressed twice) and answers
+        # typed while the exam server has not replied yet
+        if not user_answer.strip() or self.waiting_for_server:
+            return
+
+        if self.exam is not None:
+            self.check_exam_answer(user_answer)
+            return
+
         if self.isCorrect(user_answer):
-            if self.attemps == 0:
+            self.timings.question_answered(True)
+            self.record_adaptive(1.0 if self.attempts == 0 else 0.5)
+            if self.attempts == 0:
                 self.score += 10
-                messagebox.showinfo("Correct! 𑣲", "Well done! +10 points")
+                self.show_feedback("Correct! 𑣲 Well done! +10 points", '#228b22')
             else: 
                 self.score += 5
-                messagebox.showinfo("Good! ⋆˚࿔", "Correct on second try! +5 points")
+                self.show_feedback("Good! ⋆˚࿔ Correct on second try! +5 points", '#228b22')
             self.next_question()
         else:
             self.attempts += 1
             if self.attempts == 1:
-                messagebox.showwarning("Try again ₊˚⊹", "That's not quite right. One more attempt!")    
+                self.show_feedback("Try again ₊˚⊹ That's not quite right. One more attempt!", '#ff8c00')
                 self.answer_entry.delete(0, tk.END)
             else:
-                if self.operation == '+':
-                    correct_answer = self.num1 + self.num2
-                else:
-                    correct_answer = self.num1 - self.num2
-                messagebox.showerror("Incorrect ૮ ․ ․ ྀིა", f"The correct answer was {correct_answer}")
+                self.timings.question_answered(False)
+                self.record_adaptive(0.0)
+                self.show_feedback(f"Incorrect ૮ ․ ․ ྀིა The correct answer was {self.answer}", '#dc143c', 2500)
                 self.next_question()
 
+    def set_answer_enabled(self, enabled):
+        # Submit is disabled while a reply or the results are pending
+        self.waiting_for_server = not enabled
+        self.submit_btn.config(state = 'normal' if enabled else 'disabled')
+
+    def check_exam_answer(self, user_answer):
+        self.set_answer_enabled(False)
+        self.tasks.submit(
+            self.tasks.run_blocking(self.exam.answer, user_answer),
+            callback = self.exam_answered,
+            errback = self.exam_answer_failed
+            )
+
+    def exam_answer_failed(self, error):
+        self.set_answer_enabled(True)
+        self.show_feedback(f"Exam server problem: {error}", '#dc143c', 4000)
+
+    def exam_answered(self, reply):
+        self.set_answer_enabled(True)
+        self.score = reply['score']
+        if reply['correct']:
+            self.timings.question_answered(True)
+            self.show_feedback(f"Correct! 𑣲 +{reply['points']} points", '#228b22')
+        elif reply['retry']:
+            self.show_feedback("Try again ₊˚⊹ That's not quite right. One more attempt!", '#ff8c00')
+            self.answer_entry.delete(0, tk.END)
+            return
+        else:
+            self.timings.question_answered(False)
+            self.show_feedback(f"Incorrect ૮ ․ ․ ྀིა The correct answer was {reply['correct_answer']}", '#dc143c', 2500)
+
+        self.exam_question = reply['question']
+        self.next_question()
+
+    def record_adaptive(self, result):
+        # Only adaptive sessions feed the skill estimate
+        if self.difficulty == "adaptive":
+            self.adaptive.record(result)
+
     def next_question(self):
         self.current_question += 1
         self.score_label.config(text = f"Score: {self.score}")
@@ -230,7 +445,62 @@ class MathsQuiz:
         else:
             grade = "D ᰔ Keep Practicing!" 
 
-        result_text = f"Final Score: {self.score}/100\nGrade: {grade}"
+        result_text = f"Final Score: {self.score}/100\nGrade: {grade}\n\n{self.timings.describe_session()}"
+
+        # The dialog opens straight after the last answer, so repeat its
+        # feedback there rather than let the dialog hide it
+        last_feedback = self.feedback_label.cget("text")
+        if last_feedback:
+            result_text = f"Last question: {last_feedback}\n\n" + result_text
+
+        self.tasks.submit(
+            self.tasks.run_blocking(self.timings.export_session, SESSIONS_DIR, self.score),
+            errback = lambda e: print(f"Could not save session timings: {e}")
+            )
+
+        if self.questions.history_path is not None:
+            self.tasks.submit(
+                self.tasks.run_blocking(write_history, self.questions.history_path, self.questions.snapshot()),
+                errback = lambda e: print(f"Could not save question history: {e}")
+                )
+
+        if self.student_number is not None:
+            self.tasks.submit(
+                self.tasks.run_blocking(self.exporter.record, self.student_number, self.student, self.score),
+                errback = lambda e: print(f"Could not export score to marks file: {e}")
+                )
+
+        self.clear_feedback()
+
+        # The result is stored and the leaderboard fetched off the UI
+        # thread; the dialog opens when both are done
+        self.set_answer_enabled(False)
+        self.tasks.submit(
+            self.save_and_rank(),
+            callback = lambda top_scores: self.show_results(result_text, top_scores),
+            errback = lambda e: self.show_results(result_text, [])
+            )
+
+    async def save_and_rank(self):
+        try:
+            await self.tasks.run_blocking(self.results.add_result, self.student, self.difficulty, self.score)
+        except OSError as e:
+            print(f"Could not save result: {e}")
+
+        if self.exam is not None:
+            # Show the whole room's leaderboard rather than this machine's
+            try:
+                return (await self.tasks.run_blocking(self.exam.leaderboard, self.difficulty))[:5]
+            except (OSError, RuntimeError) as e:
+                print(f"Could not fetch exam leaderboard: {e}")
+        return self.results.leaderboard(self.difficulty, 5)
+
+    def show_results(self, result_text, top_scores):
+        self.set_answer_enabled(True)
+        if top_scores:
+            result_text += f"\n\nTop scores ({self.difficulty}):"
+            for rank, (student, score, finished) in enumerate(top_scores, 1):
+                result_text += f"\n{rank}. {student} - {score}"
 
         messagebox.showinfo("Quiz Completed ૮ ․ ․ ྀིა", result_text)
 
@@ -242,10 +512,49 @@ class MathsQuiz:
         else:
             self.window.quit()
 
+    def flush_exports(self):
+        # Time-based flush for a part-filled batch, off the UI thread
+        self.tasks.submit(
+            self.tasks.run_blocking(self.exporter.flush_if_due),
+            errback = lambda e: print(f"Could not export scores to marks file: {e}")
+            )
+        self.window.after(5000, self.flush_exports)
+
     def run(self):
-        self.window.mainloop()
+        self.window.after(5000, self.flush_exports)
+        monitor = StallMonitor(self.window, "maths_quiz")
+        monitor.start()
+        # Control-F12 or SIGUSR1 toggles cProfile (see profiler_toggle.py)
+        profiler = ProfilerToggle(self.window, "maths_quiz")
+        profiler.install()
+        try:
+            self.tasks.run()
+        finally:
+            profiler.uninstall()
+            monitor.stop()
+            self.results.close()
+            try:
+                self.exporter.close()
+            except (OSError, ValueError) as e:
+                print(f"Could not export scores to marks file: {e}")
+            if self.exam is not None:
+                self.exam.close()
 
 # Start the quiz
 if __name__ == "__main__":
-    quiz = MathsQuiz()
-    quiz.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description = "Maths Quiz")
+    parser.add_argument("--server", metavar = "HOST:PORT", help = "take the exam from an exam server")
+    parser.add_argument("--remember-questions", action = "store_true",
+                        help = "do not repeat questions for a student across sessions")
+    args = parser.parse_args()
+
+    exam = None
+    if args.server:
+        host, _, port = args.server.rpartition(":")
+        exam = ExamClient(host or "127.0.0.1", int(port))
+
+    # A1_RECORD_SESSION=file.json records this session for session_replay.py
+    recorder = record_from_env(MathsQuiz, 'quiz')
+    quiz = MathsQuiz(exam, args.remember_questions)
+    quiz.run()
+    save_from_env(recorder)
\ No newline at end of file
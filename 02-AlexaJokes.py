@@ -5,9 +5,10 @@ A Tkinter-based GUI application that tells random jokes with interactive feature
 Features:
 - Welcome screen with styled entry point
 - Random joke selection from file with fallback system
+- Category selector over a sharded, lazily loaded joke library
 - Setup and punchline display with timing control
 - 5-star rating system with humorous responses
-- Multiple sound effects for punchlines and celebrations
+- Multiple sound effects for punchlines and celebrations, decoded on demand
 - Background images that change during joke delivery
 - Surprise mode with unexpected content
 - Comprehensive error handling and user feedback
@@ -15,8 +16,11 @@ Features:
 
 File Structure:
 Assessment 1 - Skills Portfolio/
+├── A1 - Resources.bundle        # Optional packed copy (python asset_bundle.py pack)
 ├── A1 - Resources/
-│   ├── randomJokes.txt          # Joke database
+│   ├── randomJokes.txt          # Joke database ("Random" category)
+│   ├── Jokes/                   # Optional category shards (see joke_library.py)
+│   │   └── <category>.txt
 │   ├── Photos/
 │   │   ├── neutral.png          # Default background image
 │   │   └── cry.png              # Punchline reaction image
@@ -35,10 +39,16 @@ Course: Programming Skills Portfolio
 import tkinter as tk
 from tkinter import ttk
 import random
-from pathlib import Path
 import pygame
 from PIL import Image, ImageTk
 import os
+from asset_bundle import AssetResolver
+from stall_monitor import StallMonitor
+from profiler_toggle import ProfilerToggle
+from tk_asyncio import TkAsyncio
+from session_replay import record_from_env, save_from_env
+from joke_library import JokeLibrary, ALL
+from sound_bank import SoundBank
 
 class AlexaJokeApp:
     """
@@ -79,16 +89,26 @@ class AlexaJokeApp:
             'star_inactive': '#d3d3d3' # Inactive star rating
         }
         
+        # Asset bundle (one mmap) or resources folder, found from any directory
+        self.assets = AssetResolver()
+        
         # Initialize media storage
-        self.sounds = {}    # Dictionary for sound effects
+        self.sound_bank = SoundBank(self.assets)  # Sound effects, decoded on first use
+        self.pending_sound = None                  # Punchline sound chosen in advance
         self.images = {}    # Dictionary for background images
         
+        # asyncio loop driven by Tk for background work (see tk_asyncio.py)
+        self.tasks = TkAsyncio(root)
+        
         # Load external resources
         self.load_sounds()
         self.load_images()
         
         # Application state variables
-        self.jokes = []              # Loaded jokes list
+        self.jokes = []              # Backup jokes when no shard loads
+        self.library = None          # Sharded joke library
+        self.category = ALL          # Selected joke category
+        self.prefetching = False     # A shard is loading in the background
         self.current_joke = None     # Currently displayed joke
         self.punchline_shown = False # Punchline visibility state
         self.rating_given = False    # Rating submission state
@@ -109,32 +129,22 @@ class AlexaJokeApp:
         Supports PNG format with automatic resizing for display.
         """
         try:
-            photos_path = Path("Assessment 1 - Skills Portfolio/A1 - Resources/Photos")
-            
-            # Check if photos directory exists
-            if not photos_path.exists():
+            # Check if any photos are available
+            if not self.assets.names("Photos/"):
                 self.show_welcome_error("Images folder not found - running without images")
                 return
             
-            # Load neutral background image
-            neutral_path = photos_path / "neutral.png"
-            if neutral_path.exists():
-                image = Image.open(neutral_path)
-                image = image.resize((200, 150), Image.LANCZOS)  # Optimize for display
-                self.images['neutral'] = ImageTk.PhotoImage(image)
-                print("Loaded neutral.png successfully")
-            else:
-                print("neutral.png not found in Photos folder")
-            
-            # Load cry reaction image for punchlines
-            cry_path = photos_path / "cry.png"
-            if cry_path.exists():
-                image = Image.open(cry_path)
-                image = image.resize((200, 150), Image.LANCZOS)  # Consistent sizing
-                self.images['cry'] = ImageTk.PhotoImage(image)
-                print("Loaded cry.png successfully")
-            else:
-                print("cry.png not found in Photos folder")
+            # Load neutral background and cry reaction images
+            for name in ('neutral', 'cry'):
+                asset_name = f"Photos/{name}.png"
+                if self.assets.exists(asset_name):
+                    with self.assets.open(asset_name) as file:
+                        image = Image.open(file)
+                        image = image.resize((200, 150), Image.LANCZOS)  # Optimize for display
+                    self.images[name] = ImageTk.PhotoImage(image)
+                    print(f"Loaded {name}.png successfully")
+                else:
+                    print(f"{name}.png not found in Photos folder")
                 
         except Exception as e:
             print(f"Image loading error: {e}")
@@ -154,17 +164,15 @@ class AlexaJokeApp:
 
     def load_sounds(self):
         """
-        Load sound effects from Sounds directory.
+        Register sound effects from Sounds directory.
         
-        Supports multiple audio formats (WAV, OGG, MP3) and provides
-        comprehensive error reporting for missing or corrupted files.
-        Creates fallback sounds if no files are available.
+        Supports multiple audio formats (WAV, OGG, MP3). Files are only
+        checked for here; the sound bank decodes each one when it is
+        first needed. Creates fallback sounds if no files are available.
         """
         try:
-            sound_path = Path("Assessment 1 - Skills Portfolio/A1 - Resources/Sounds")
-            
-            # Verify sounds directory exists
-            if not sound_path.exists():
+            # Verify any sounds are available
+            if not self.assets.names("Sounds/"):
                 self.show_welcome_error("Sounds folder not found - using fallback sounds")
                 self.create_fallback_sounds()
                 return
@@ -181,24 +189,18 @@ class AlexaJokeApp:
             loaded_sounds = 0
             missing_sounds = []
             
-            # Attempt to load each sound file
+            # Register each sound file (decoded later, on first use)
             for category, filename in sound_files.items():
-                file_path = sound_path / filename
-                if file_path.exists():
-                    try:
-                        self.sounds[category] = pygame.mixer.Sound(file_path)
-                        loaded_sounds += 1
-                        print(f"✓ Loaded {filename}")
-                    except Exception as e:
-                        print(f"✗ Failed to load {filename}: {e}")
-                        missing_sounds.append(filename)
+                if self.sound_bank.register(category, f"Sounds/{filename}"):
+                    loaded_sounds += 1
+                    print(f"✓ Found {filename}")
                 else:
                     print(f"✗ File not found: {filename}")
                     missing_sounds.append(filename)
             
             # Report loading results
             if loaded_sounds > 0:
-                print(f"Successfully loaded {loaded_sounds} sound files")
+                print(f"Successfully registered {loaded_sounds} sound files")
             else:
                 self.show_welcome_error("No sound files loaded - using fallback sounds")
                 self.create_fallback_sounds()
@@ -220,51 +222,92 @@ class AlexaJokeApp:
         """
         try:
             # Create basic tone-based fallback sounds
-            self.sounds['laughter'] = pygame.mixer.Sound(buffer=bytes([100] * 512))
-            self.sounds['applause'] = pygame.mixer.Sound(buffer=bytes([150] * 512))
-            self.sounds['crowd_wow'] = pygame.mixer.Sound(buffer=bytes([200] * 512))
+            self.sound_bank.add('laughter', pygame.mixer.Sound(buffer=bytes([100] * 512)))
+            self.sound_bank.add('applause', pygame.mixer.Sound(buffer=bytes([150] * 512)))
+            self.sound_bank.add('crowd_wow', pygame.mixer.Sound(buffer=bytes([200] * 512)))
             print("Created fallback sounds")
         except:
+            # Continue without sound if creation fails
             print("Failed to create fallback sounds")
-            # Set to None if sound creation fails
-            self.sounds['laughter'] = None
-            self.sounds['applause'] = None
-            self.sounds['crowd_wow'] = None
 
     def load_jokes(self):
         """
-        Load jokes from randomJokes.txt file.
+        Discover the joke shards (randomJokes.txt and Jokes/*.txt).
         
-        Parses the joke file, validates format, and provides comprehensive
-        error handling for file access and format issues.
+        Only shard headers and counts are read here; each category is
+        loaded the first time it is used. Falls back to built-in jokes
+        when no shard is found.
         """
         try:
-            file_path = Path("Assessment 1 - Skills Portfolio/A1 - Resources/randomJokes.txt")
+            self.library = JokeLibrary(self.assets)
             
-            # Check if joke file exists
-            if not file_path.exists():
+            # Validate that jokes were found
+            if not self.library.shards:
                 self.show_welcome_error("Joke file not found - using backup jokes")
                 self.jokes = self.get_fallback_jokes()
-                return
-            
-            # Read and parse joke file
-            with open(file_path, 'r', encoding='utf-8') as file:
-                lines = [line.strip() for line in file if line.strip()]
-                # Filter for valid jokes (must contain question mark)
-                self.jokes = [line for line in lines if '?' in line]
-            
-            # Validate that jokes were loaded
-            if not self.jokes:
-                self.show_welcome_error("No valid jokes found in file - using backup")
-                self.jokes = self.get_fallback_jokes()
             else:
-                print(f"✓ Loaded {len(self.jokes)} jokes successfully")
+                print(f"✓ Found {self.library.total()} jokes in {len(self.library.shards)} categories")
+                self.prefetch_shard()
                     
         except Exception as e:
             print(f"Joke loading error: {e}")
             self.show_welcome_error("Error loading jokes - using backup")
             self.jokes = self.get_fallback_jokes()
 
+    def pick_joke(self):
+        """
+        Choose a random joke from the selected category.
+        
+        Returns:
+            str: The joke, or None if none are available
+        """
+        if self.library is not None and self.library.shards:
+            joke = self.library.random_joke(self.category)
+            if self.category == ALL:
+                self.prefetch_shard()
+            if joke is not None:
+                return joke
+        return random.choice(self.jokes) if self.jokes else None
+
+    def prefetch_shard(self):
+        """
+        Load one more shard in the background for the "All" category.
+        
+        "All" only picks from shards already in memory, so the UI thread
+        never waits for a load; one shard at a time is loaded here.
+        """
+        if self.prefetching:
+            return
+        category = self.library.next_prefetch()
+        if category is None:
+            return
+        
+        def done(result):
+            self.prefetching = False
+        
+        self.prefetching = True
+        self.tasks.submit(self.tasks.run_blocking(self.library.jokes, category),
+                          callback=done, errback=done)
+
+    def select_category(self):
+        """
+        Switch joke category from the selector.
+        
+        The category's shard is loaded in the background so the next
+        joke does not wait for it.
+        """
+        self.category = self.category_box.get()
+        if self.category == ALL or self.library is None:
+            self.show_error_message("Jokes from every category")
+            return
+        
+        category = self.category
+        self.show_error_message(f"Loading {category} jokes...")
+        self.tasks.submit(
+            self.tasks.run_blocking(self.library.jokes, category),
+            callback=lambda jokes: self.show_error_message(f"{len(jokes)} {category} jokes ready")
+        )
+
     def get_fallback_jokes(self):
         """
         Provide curated fallback jokes when file loading fails.
@@ -372,6 +415,9 @@ class AlexaJokeApp:
         )
         title_label.pack(pady=20)
         
+        # Category selector
+        self.setup_category_selector(main_frame)
+        
         # Joke display area
         self.joke_frame = tk.Frame(
             main_frame, 
@@ -424,6 +470,31 @@ class AlexaJokeApp:
         # Start with first joke
         self.show_new_joke()
 
+    def setup_category_selector(self, parent):
+        """Create the joke category drop-down."""
+        category_frame = tk.Frame(parent, bg=self.colors['bg'])
+        category_frame.pack()
+        
+        category_label = tk.Label(
+            category_frame,
+            text="Category:",
+            font=("Verdana", 10),
+            fg=self.colors['text'],
+            bg=self.colors['bg']
+        )
+        category_label.pack(side='left', padx=5)
+        
+        categories = self.library.categories() if self.library is not None and self.library.shards else [ALL]
+        self.category_box = ttk.Combobox(
+            category_frame,
+            values=categories,
+            state='readonly',
+            width=20
+        )
+        self.category_box.set(self.category if self.category in categories else ALL)
+        self.category_box.pack(side='left')
+        self.category_box.bind('<<ComboboxSelected>>', lambda e: self.select_category())
+
     def setup_rating_system(self):
         """Initialize the 5-star rating interface components."""
         self.rating_frame = tk.Frame(self.joke_frame, bg=self.colors['accent2'])
@@ -565,15 +636,30 @@ class AlexaJokeApp:
             # Clear message after 4 seconds
             self.root.after(4000, lambda: self.status_label.config(text=""))
 
+    def choose_punchline_sound(self):
+        """
+        Pick the sound for the next punchline and decode it in the background.
+        
+        Called when a joke is shown, so the sound is ready by the time
+        the punchline is.
+        """
+        sound_options = ['laughter', 'cricket', 'fbi']
+        available_sounds = [s for s in sound_options if s in self.sound_bank]
+        self.pending_sound = random.choice(available_sounds) if available_sounds else None
+        if self.pending_sound:
+            self.tasks.submit(self.tasks.run_blocking(self.sound_bank.prefetch, self.pending_sound))
+
     def play_punchline_sound(self):
         """Play a randomly selected sound effect for punchline delivery."""
         try:
-            sound_options = ['laughter', 'cricket', 'fbi']
-            available_sounds = [s for s in sound_options if s in self.sounds and self.sounds[s]]
+            if self.pending_sound is None:
+                self.choose_punchline_sound()
+            selected_sound = self.pending_sound
+            self.pending_sound = None
+            sound = self.sound_bank.get(selected_sound) if selected_sound else None
             
-            if available_sounds:
-                selected_sound = random.choice(available_sounds)
-                self.sounds[selected_sound].play()
+            if sound is not None:
+                sound.play()
                 
                 # Contextual feedback messages
                 if selected_sound == 'laughter':
@@ -592,11 +678,13 @@ class AlexaJokeApp:
         """Play celebration sound for 5-star ratings."""
         try:
             # Priority: crowd wow -> applause -> fallback
-            if 'crowd_wow' in self.sounds and self.sounds['crowd_wow']:
-                self.sounds['crowd_wow'].play()
+            crowd_wow = self.sound_bank.get('crowd_wow')
+            applause = self.sound_bank.get('applause') if crowd_wow is None else None
+            if crowd_wow is not None:
+                crowd_wow.play()
                 self.show_error_message("WOW! The crowd goes wild!")
-            elif 'applause' in self.sounds and self.sounds['applause']:
-                self.sounds['applause'].play()
+            elif applause is not None:
+                applause.play()
                 self.show_error_message("Standing ovation!")
             else:
                 self.show_error_message("Celebration! (Sound effects unavailable)")
@@ -735,15 +823,18 @@ class AlexaJokeApp:
         if 'neutral' in self.images:
             self.image_label.config(image=self.images['neutral'])
         
+        # Select a random joke from the chosen category
+        joke = self.pick_joke()
+        
         # Handle empty joke list
-        if not self.jokes:
+        if joke is None:
             self.show_error_message("No jokes available! Check your joke file.")
             self.setup_label.config(text="No jokes loaded. Please check the randomJokes.txt file.")
             self.punchline_btn.config(state='disabled')
             return
         
-        # Select and parse random joke
-        self.current_joke = random.choice(self.jokes)
+        # Parse the joke
+        self.current_joke = joke
         if '?' in self.current_joke:
             setup, punchline = self.current_joke.split('?', 1)
             setup = setup.strip() + "?"
@@ -760,6 +851,9 @@ class AlexaJokeApp:
         self.punchline_btn.config(state='normal')
         self.rate_btn.config(state='disabled')
         
+        # Get the punchline sound ready while the user reads the setup
+        self.choose_punchline_sound()
+        
         # Reset rating display
         for star in self.star_buttons:
             star.config(fg=self.colors['star_inactive'])
@@ -809,6 +903,10 @@ class AlexaJokeApp:
         
         self.rating_frame.pack(pady=10)
         self.show_error_message("Let me know how I did!")
+        
+        # A 5-star rating plays the celebration sound; decode it now
+        celebration = 'crowd_wow' if 'crowd_wow' in self.sound_bank else 'applause'
+        self.tasks.submit(self.tasks.run_blocking(self.sound_bank.prefetch, celebration))
 
     def rate_joke(self, stars):
         """
@@ -856,9 +954,22 @@ def main():
     
     Initializes Tkinter and starts the Alexa Joke Teller application.
     """
+    # A1_RECORD_SESSION=file.json records this session for session_replay.py
+    recorder = record_from_env(AlexaJokeApp, 'jokes')
     root = tk.Tk()
     app = AlexaJokeApp(root)
-    root.mainloop()
+    monitor = StallMonitor(root, "alexa_jokes")
+    monitor.start()
+    # Control-F12 or SIGUSR1 toggles cProfile (see profiler_toggle.py)
+    profiler = ProfilerToggle(root, "alexa_jokes")
+    profiler.install()
+    try:
+        app.tasks.run()
+    finally:
+        profiler.uninstall()
+        monitor.stop()
+    save_from_env(recorder)
+    print(f"Sound bank: {app.sound_bank.stats()}")
 
 
 if __name__ == "__main__":
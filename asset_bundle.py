@@ -0,0 +1,254 @@
+"""
+Asset Bundle
+Packs the A1 - Resources folder into one file that the apps map into
+memory once at startup, and resolves assets from any working directory.
+
+Bundle layout:
+    8 bytes   magic b"A1BUNDLE"
+    4 bytes   format version (little-endian)
+    4 bytes   manifest length in bytes (little-endian)
+    manifest  UTF-8 JSON: {"assets": [{"name", "type", "offset", "length", "sha256"}, ...]}
+    data      asset bytes, each starting on an 8-byte boundary
+
+Names are paths relative to the resources folder with forward slashes,
+e.g. "Sounds/57814__timtube__laughing-9.wav". Offsets are from the start
+of the file.
+
+AssetResolver looks for the bundle next to the resources folder (or at
+$A1_ASSET_BUNDLE) and falls back to reading the folder itself, both
+located from this file's directory rather than the current directory.
+
+Usage:
+    python asset_bundle.py pack [resources_dir] [bundle_file]
+    python asset_bundle.py list [bundle_file]
+    python asset_bundle.py verify [bundle_file]
+"""
+
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent / "Assessment 1 - Skills Portfolio"
+RESOURCES_DIR = BASE_DIR / "A1 - Resources"
+BUNDLE_FILE = BASE_DIR / "A1 - Resources.bundle"
+
+MAGIC = b"A1BUNDLE"
+VERSION = 1
+HEADER = struct.Struct("<8sII")
+ALIGNMENT = 8
+
+# File extension -> asset type recorded in the manifest
+ASSET_TYPES = {
+    '.wav': 'sound', '.ogg': 'sound', '.mp3': 'sound',
+    '.png': 'image', '.jpg': 'image', '.gif': 'image',
+    '.txt': 'text', '.md': 'text'
+}
+
+# Sidecar files written next to the marks file are never packed
+SKIP_SUFFIXES = ('.idx', '.log', '.lock', '.tmp')
+
+
+class BundleError(Exception):
+    """Raised when a bundle file is missing pieces or corrupted."""
+
+
+def pack(source_dir=RESOURCES_DIR, bundle_path=BUNDLE_FILE):
+    """
+    Build a bundle from every file under a folder.
+
+    Args:
+        source_dir (Path): Folder to pack
+        bundle_path (Path): Output bundle file (replaced atomically)
+
+    Returns:
+        list: Manifest entries that were written
+    """
+    source_dir = Path(source_dir)
+    files = sorted(path for path in source_dir.rglob('*')
+                   if path.is_file() and path.suffix not in SKIP_SUFFIXES)
+
+    entries = []
+    offset = 0
+    for path in files:
+        data = path.read_bytes()
+        entries.append({
+            'name': path.relative_to(source_dir).as_posix(),
+            'type': ASSET_TYPES.get(path.suffix.lower(), 'binary'),
+            'offset': offset,
+            'length': len(data),
+            'sha256': hashlib.sha256(data).hexdigest()
+        })
+        offset += -(-len(data) // ALIGNMENT) * ALIGNMENT
+
+    # Offsets above are relative to the data section; fix them up once the
+    # manifest size is known (it only grows, so iterate until it settles)
+    data_start = 0
+    while True:
+        manifest = json.dumps({'assets': entries}, separators=(',', ':')).encode('utf-8')
+        start = -(-(HEADER.size + len(manifest)) // ALIGNMENT) * ALIGNMENT
+        if start == data_start:
+            break
+        for entry in entries:
+            entry['offset'] += start - data_start
+        data_start = start
+
+    bundle_path = Path(bundle_path)
+    temp_path = bundle_path.with_name(bundle_path.name + ".tmp")
+    with open(temp_path, 'wb') as bundle:
+        bundle.write(HEADER.pack(MAGIC, VERSION, len(manifest)))
+        bundle.write(manifest)
+        for path, entry in zip(files, entries):
+            bundle.write(b'\0' * (entry['offset'] - bundle.tell()))
+            bundle.write(path.read_bytes())
+    os.replace(temp_path, bundle_path)
+    return entries
+
+
+class AssetBundle:
+    """
+    A bundle file mapped into memory once.
+
+    Attributes:
+        manifest (dict): asset name -> manifest entry
+    """
+
+    def __init__(self, bundle_path=BUNDLE_FILE):
+        """
+        Args:
+            bundle_path (Path): Bundle to open
+
+        Raises:
+            BundleError: If the file is not a valid bundle
+        """
+        with open(bundle_path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, manifest_length = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise BundleError(f"{bundle_path} is not a version {VERSION} asset bundle")
+        try:
+            entries = json.loads(self.map[HEADER.size:HEADER.size + manifest_length])['assets']
+        except (ValueError, KeyError):
+            self.map.close()
+            raise BundleError(f"{bundle_path} has a damaged manifest") from None
+        self.manifest = {entry['name']: entry for entry in entries}
+        for entry in entries:
+            if entry['offset'] + entry['length'] > len(self.map):
+                self.map.close()
+                raise BundleError(f"{bundle_path} is truncated")
+
+    def read(self, name):
+        """
+        Zero-copy view of an asset's bytes.
+
+        Raises:
+            KeyError: If the bundle has no such asset
+        """
+        entry = self.manifest[name]
+        return memoryview(self.map)[entry['offset']:entry['offset'] + entry['length']]
+
+    def verify(self):
+        """
+        Check every asset against its recorded hash.
+
+        Returns:
+            list: Names of assets whose contents do not match
+        """
+        return [name for name, entry in self.manifest.items()
+                if hashlib.sha256(self.read(name)).hexdigest() != entry['sha256']]
+
+
+class AssetResolver:
+    """
+    Finds assets in the bundle, or in the resources folder without one.
+    """
+
+    def __init__(self, bundle_path=None, resources_dir=RESOURCES_DIR):
+        """
+        Args:
+            bundle_path (Path, optional): Bundle to use (default: $A1_ASSET_BUNDLE or BUNDLE_FILE)
+            resources_dir (Path): Folder used when no bundle can be opened
+        """
+        self.resources_dir = Path(resources_dir)
+        self.bundle = None
+        bundle_path = bundle_path or os.environ.get("A1_ASSET_BUNDLE") or BUNDLE_FILE
+        try:
+            self.bundle = AssetBundle(bundle_path)
+        except (OSError, ValueError, BundleError) as e:
+            if Path(bundle_path).exists():
+                print(f"Asset bundle unusable ({e}) - reading {self.resources_dir}")
+
+    def exists(self, name):
+        """Whether an asset such as "Photos/cry.png" is available."""
+        if self.bundle is not None:
+            return name in self.bundle.manifest
+        return (self.resources_dir / name).is_file()
+
+    def names(self, prefix=""):
+        """Asset names starting with a prefix (e.g. "Sounds/")."""
+        if self.bundle is not None:
+            return sorted(name for name in self.bundle.manifest if name.startswith(prefix))
+        folder = self.resources_dir
+        return sorted(path.relative_to(folder).as_posix()
+                      for path in folder.rglob('*')
+                      if path.is_file() and path.relative_to(folder).as_posix().startswith(prefix))
+
+    def read_bytes(self, name):
+        """
+        Contents of an asset.
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        if self.bundle is not None:
+            if name not in self.bundle.manifest:
+                raise FileNotFoundError(name)
+            return self.bundle.read(name)
+        return (self.resources_dir / name).read_bytes()
+
+    def read_head(self, name, size):
+        """First `size` bytes of an asset, without reading the rest of it."""
+        if self.bundle is not None:
+            return bytes(self.read_bytes(name)[:size])
+        with open(self.resources_dir / name, 'rb') as file:
+            return file.read(size)
+
+    def open(self, name):
+        """Binary file object for libraries that want one (pygame, PIL)."""
+        if self.bundle is not None:
+            return io.BytesIO(self.read_bytes(name))
+        return open(self.resources_dir / name, 'rb')
+
+    def read_text(self, name, encoding='utf-8'):
+        """Asset decoded as text."""
+        return bytes(self.read_bytes(name)).decode(encoding)
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == 'pack':
+        source = Path(sys.argv[2]) if len(sys.argv) > 2 else RESOURCES_DIR
+        target = Path(sys.argv[3]) if len(sys.argv) > 3 else BUNDLE_FILE
+        entries = pack(source, target)
+        print(f"Packed {len(entries)} assets into {target} ({target.stat().st_size} bytes)")
+    elif command in ('list', 'verify'):
+        bundle = AssetBundle(Path(sys.argv[2]) if len(sys.argv) > 2 else BUNDLE_FILE)
+        if command == 'list':
+            for name, entry in sorted(bundle.manifest.items()):
+                print(f"{entry['length']:>10}  {entry['type']:<6}  {name}")
+        else:
+            bad = bundle.verify()
+            print("All assets OK" if not bad else "Corrupted: " + ", ".join(bad))
+            sys.exit(1 if bad else 0)
+    else:
+        print(__doc__.split("Usage:")[1].rstrip())
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
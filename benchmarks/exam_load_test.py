@@ -0,0 +1,114 @@
+"""
+Load Test for the Exam Server
+Opens many concurrent exam sessions and reports answer round-trip latency.
+
+Each simulated student connects, starts an exam and answers every question
+(right or wrong at random, with a short think time), timing each answer
+request from send to reply.
+
+Usage:
+    python benchmarks/exam_load_test.py [--clients 500] [--think 0.01]
+                                        [--host 127.0.0.1] [--port 8765] [--local]
+
+With --local an in-process server is started on a free port, so no
+separate server is needed. It records finished exams in a ResultsStore in
+a temporary folder, so the cost of writing results is measured too.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from exam_server import ExamServer
+from quiz_results import ResultsStore
+from quiz_stats import LatencyHistogram
+
+
+async def request(reader, writer, **message):
+    writer.write((json.dumps(message) + '\n').encode('utf-8'))
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def simulate_student(number, host, port, think, histogram, failures):
+    """Play one full exam and record the round trip of every answer."""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        failures.append(number)
+        return
+    try:
+        reply = await request(reader, writer, op='start', student=f"load-{number}",
+                              difficulty=random.choice(('easy', 'moderate', 'advanced')))
+        if not reply['ok']:
+            failures.append(number)
+            return
+        session = reply['session']
+        finished = False
+        while not finished:
+            await asyncio.sleep(random.uniform(0, think * 2))
+            started = time.perf_counter_ns()
+            reply = await request(reader, writer, op='answer', session=session,
+                                  answer=str(random.randint(0, 20)))
+            histogram.record(time.perf_counter_ns() - started)
+            if not reply['ok']:
+                failures.append(number)
+                return
+            finished = reply['finished']
+    finally:
+        writer.close()
+
+
+async def run(args):
+    server = exam = results = scratch = None
+    host, port = args.host, args.port
+    if args.local:
+        scratch = tempfile.TemporaryDirectory(prefix="exam-load-")
+        results = ResultsStore(scratch.name)
+        exam = ExamServer(results)
+        server = await asyncio.start_server(exam.handle_client, host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    histogram = LatencyHistogram()
+    failures = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        simulate_student(number, host, port, args.think, histogram, failures)
+        for number in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - started
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+        exam.close()
+        results.close()
+        scratch.cleanup()
+
+    stats = histogram.summary()
+    print(f"clients: {args.clients}  failed: {len(failures)}  wall time: {elapsed:.2f}s")
+    print(f"answers: {stats['count']}  ({stats['count'] / elapsed:.0f}/s)")
+    print("round trip ms  " + "  ".join(
+        f"p{pct}: {histogram.percentile(pct) * 1000:.2f}" for pct in (50, 90, 99)
+    ) + f"  max: {histogram.max_micros / 1000:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Maths Quiz exam server")
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--think', type=float, default=0.01, help="mean seconds between answers")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--local', action='store_true', help="start a server in this process")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
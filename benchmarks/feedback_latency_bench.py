@@ -0,0 +1,136 @@
+"""
+Question-to-Question Latency: Inline Feedback vs Modal Dialogs
+Answers questions through the real MathsQuiz and times each one from the
+answer being submitted (what Enter does) until the next question is on
+screen and ready for input, in two flows:
+
+    inline   the quiz as it is: feedback in a label that clears itself
+    modal    the same quiz with every feedback message shown in a
+             tkinter.messagebox, as check_answer did before
+
+A modal dialog stays up until someone dismisses it. The benchmark presses
+its OK button after --reaction seconds (default 0, so only the dialog's
+own cost is measured); a student's real reaction time adds that much to
+every modal answer, plus the extra keypress or click.
+
+Usage:
+    python benchmarks/feedback_latency_bench.py [questions] [--reaction 0.3]
+
+Needs a display (or Xvfb) and Tk's own message box (X11; native dialogs
+on Windows and macOS cannot be dismissed from a script). Results and
+timing exports go to a temporary folder.
+"""
+
+import argparse
+import importlib.util
+import sys
+import tempfile
+import time
+from pathlib import Path
+from tkinter import messagebox as tk_messagebox
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from quiz_stats import LatencyHistogram
+
+
+class HeadlessMessages:
+    """Stand-in for the results dialogs, which are not part of the measurement."""
+
+    def showinfo(self, title, message):
+        return "ok"
+
+    def showerror(self, title, message):
+        return "ok"
+
+    def askyesno(self, title, message):
+        return True
+
+
+def load_quiz_module():
+    """Import 01-MathsQuiz.py (its file name is not a valid module name)."""
+    spec = importlib.util.spec_from_file_location("maths_quiz", ROOT / "01-MathsQuiz.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def modal_feedback(quiz, reaction_ms):
+    """show_feedback replacement that opens a message box per answer, as before."""
+    root = quiz.window
+    dialog = ".__tk__messagebox" if str(root) == "." else f"{root}.__tk__messagebox"
+
+    def press_ok():
+        # Count the reaction from when the dialog is on screen
+        if not (int(root.tk.call("winfo", "exists", dialog))
+                and int(root.tk.call("winfo", "ismapped", dialog))):
+            root.after(1, press_ok)
+            return
+        # tk_messageBox waits on ::tk::Priv(button); setting it presses OK
+        root.after(reaction_ms, lambda: root.tk.call("set", "::tk::Priv(button)", "ok"))
+
+    def show_feedback(text, colour, delay=1500):
+        root.after(1, press_ok)
+        tk_messagebox.showinfo("Feedback", text, parent=root)
+    return show_feedback
+
+
+def measure(quiz, questions):
+    """
+    Answer questions correctly and time submit -> next question ready.
+
+    Returns:
+        LatencyHistogram: One sample per question
+    """
+    histogram = LatencyHistogram()
+    quiz.total_questions = questions + 1     # never reach the results
+    quiz.set_difficulty("easy")
+    quiz.window.update()
+    for _ in range(questions):
+        quiz.answer_entry.delete(0, "end")
+        quiz.answer_entry.insert(0, str(quiz.answer))
+        started = time.perf_counter_ns()
+        quiz.check_answer()
+        quiz.window.update_idletasks()      # next question drawn
+        histogram.record(time.perf_counter_ns() - started)
+        quiz.window.update()
+    return histogram
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare question-to-question latency")
+    parser.add_argument("questions", type=int, nargs="?", default=200)
+    parser.add_argument("--reaction", type=float, default=0.0,
+                        help="seconds before a modal dialog is dismissed")
+    args = parser.parse_args()
+
+    module = load_quiz_module()
+    scratch = Path(tempfile.mkdtemp(prefix="quiz-feedback-"))
+    module.RESULTS_DIR = scratch / "results"
+    module.SESSIONS_DIR = scratch / "sessions"
+    module.messagebox = HeadlessMessages()
+
+    results = {}
+    for flow in ("inline", "modal"):
+        quiz = module.MathsQuiz()
+        if flow == "modal":
+            quiz.show_feedback = modal_feedback(quiz, int(args.reaction * 1000))
+        try:
+            results[flow] = measure(quiz, args.questions)
+        finally:
+            quiz.tasks.close()
+            quiz.results.close()
+            quiz.window.destroy()
+
+    print(f"Submit -> next question over {args.questions} answers (ms), "
+          f"modal dismissed after {args.reaction:.2f} s")
+    print(f"{'':<24} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    for flow, label in (("inline", "inline feedback"), ("modal", "modal message boxes")):
+        histogram = results[flow]
+        row = "".join(f" {histogram.percentile(pct) * 1000:>8.3f}" for pct in (50, 90, 99))
+        print(f"  {label:<22}{row} {histogram.max_micros / 1000:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Marks Index Benchmark
+Compares MarksIndex queries with plain linear scans over the columns.
+
+Generates a synthetic studentMarks.txt (10^6 rows by default), then times:
+cold index build, warm index load, lookup by code, name prefix search,
+top/bottom 10 by total and the grade histogram.
+
+Usage:
+    python benchmarks/marks_index_bench.py [rows]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from student_marks import load_marks, grade_for
+from student_index import load_index
+
+FIRST_NAMES = ("Ana", "Ben", "Chloe", "Dev", "Eli", "Fatima", "Gus", "Hana", "Ivan", "Jo")
+LAST_NAMES = ("Curry", "Scott", "Hyde", "Hobbs", "Shearer", "Ferdinand", "Thompson", "Herrema")
+
+
+def write_marks(path, rows):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(f"{rows}\n")
+        for row in range(rows):
+            name = f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)} {row}"
+            file.write(f"{100000 + row},{name},{random.randint(0, 20)},{random.randint(0, 20)},"
+                       f"{random.randint(0, 20)},{random.randint(0, 100)}\n")
+
+
+def timed(label, function, repeat=1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"  {label:<34} {elapsed * 1000:>10.3f} ms")
+    return result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    path = Path(tempfile.mkdtemp(prefix="marks-bench-")) / "studentMarks.txt"
+    print(f"Writing {rows} rows to {path}")
+    write_marks(path, rows)
+
+    marks = timed("load columns", lambda: load_marks(path))
+    index = timed("cold index build + save", lambda: load_index(marks, path))
+    timed("warm index load", lambda: load_index(marks, path))
+    totals = index.totals
+
+    number = 100000 + rows // 2
+    prefix = "hana sc"
+    print("lookup by code")
+    timed("index", lambda: index.find_number(number), repeat=1000)
+    timed("linear scan", lambda: marks.numbers.index(number), repeat=5)
+
+    print("name prefix search")
+    timed("index", lambda: index.find_name_prefix(prefix), repeat=100)
+    timed("linear scan", lambda: [row for row in range(len(marks))
+                                  if marks.name(row).casefold().startswith(prefix)][:50])
+
+    print("top 10 / bottom 10 by total")
+    timed("index", lambda: (index.top(10), index.top(10, lowest=True)))
+    timed("full sort", lambda: sorted(range(len(marks)), key=totals.__getitem__))
+
+    print("grade histogram")
+    timed("grade column", index.grade_histogram)
+    timed("per-row records", lambda: [grade_for(marks.record(row)[4]) for row in range(len(marks))])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Replay Soak Benchmark for the Maths Quiz
+Plays the quiz through many full menu -> quiz -> results -> replay cycles
+and reports how the Tcl command table, widget count and process RSS grow.
+
+With the menu and quiz views built once, the Tcl and widget counts should
+stay flat after the first cycle and RSS should level off.
+
+Usage:
+    python benchmarks/replay_soak.py [cycles] [report_every]
+
+Needs a display (or Xvfb). Results and timing exports go to a temporary
+folder so the real quiz data is not touched.
+"""
+
+import importlib.util
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+class HeadlessMessages:
+    """Stand-in for tkinter.messagebox that never blocks and always replays."""
+
+    def showinfo(self, title, message):
+        return "ok"
+
+    def askyesno(self, title, message):
+        return True
+
+
+def load_quiz_module():
+    """Import 01-MathsQuiz.py (its file name is not a valid module name)."""
+    spec = importlib.util.spec_from_file_location("maths_quiz", ROOT / "01-MathsQuiz.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def rss_kib():
+    """Current resident set size in KiB (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def count_widgets(widget):
+    """Count a widget and all of its descendants."""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def play_cycle(quiz, level):
+    """
+    Pick a level and answer until the quiz replays back to the menu.
+
+    Answers alternate wrong/right so both feedback paths are exercised.
+    The results dialog opens from a background task, so the bridge is
+    drained after each answer.
+    """
+    quiz.set_difficulty(level)
+    wrong = False
+    while not quiz.menu_frame.winfo_manager():
+        quiz.answer_entry.delete(0, "end")
+        quiz.answer_entry.insert(0, "x" if wrong else str(quiz.answer))
+        quiz.check_answer()
+        quiz.tasks.drain()
+        wrong = not wrong
+    quiz.window.update()
+
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    report_every = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    module = load_quiz_module()
+    scratch = Path(tempfile.mkdtemp(prefix="quiz-soak-"))
+    module.RESULTS_DIR = scratch / "results"
+    module.SESSIONS_DIR = scratch / "sessions"
+    module.messagebox = HeadlessMessages()
+
+    quiz = module.MathsQuiz()
+    quiz.window.withdraw()
+    levels = ("easy", "moderate", "advanced", "adaptive")
+
+    print(f"{'cycle':>7} {'tcl cmds':>9} {'widgets':>8} {'rss KiB':>9} {'ms/cycle':>9}")
+    baseline = None
+    started = time.perf_counter()
+    for cycle in range(1, cycles + 1):
+        play_cycle(quiz, levels[cycle % len(levels)])
+        if cycle == 1 or cycle % report_every == 0:
+            commands = len(quiz.window.tk.call("info", "commands"))
+            widgets = count_widgets(quiz.window)
+            elapsed = (time.perf_counter() - started) * 1000 / cycle
+            print(f"{cycle:>7} {commands:>9} {widgets:>8} {rss_kib():>9} {elapsed:>9.2f}")
+            if baseline is None:
+                baseline = (commands, widgets)
+
+    commands = len(quiz.window.tk.call("info", "commands"))
+    widgets = count_widgets(quiz.window)
+    print(f"Tcl command growth: {commands - baseline[0]}, widget growth: {widgets - baseline[1]}")
+    quiz.tasks.close()
+    quiz.results.close()
+    quiz.window.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Tk / asyncio Bridge Benchmark
+Compares idle CPU use and background-result latency of plain mainloop()
+with the TkAsyncio bridge.
+
+Idle: the window sits idle for a few seconds and process CPU time is
+divided by wall time. Plain mainloop is measured alone and with the
+usual ad-hoc pattern (a worker thread posting into a queue.Queue that
+root.after() polls every 50 ms).
+
+Latency: a blocking call (time.sleep(0)) is handed off to a thread and
+the time until its result is seen on the UI thread is recorded, for the
+thread + polled queue pattern and for bridge.submit(run_blocking(...)).
+
+Usage:
+    python benchmarks/tk_asyncio_bench.py [idle_seconds] [round_trips] [--no-display]
+
+Needs a display (or Xvfb), unless --no-display is given: then a bare Tcl
+interpreter runs the same event loop (after timers and the notifier)
+with no window, which is all the bridge uses.
+"""
+
+import queue
+import sys
+import threading
+import time
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quiz_stats import LatencyHistogram
+from tk_asyncio import TkAsyncio
+
+POLL_INTERVAL = 50
+
+
+class TclRoot:
+    """Window-less stand-in for tk.Tk that runs Tcl's event loop."""
+
+    def __init__(self):
+        self.tcl = tk.Tcl()
+        self.running = False
+
+    def after(self, ms, func):
+        return self.tcl.after(ms, func)
+
+    def after_idle(self, func):
+        return self.tcl.after_idle(func)
+
+    def after_cancel(self, after_id):
+        self.tcl.after_cancel(after_id)
+
+    def mainloop(self):
+        # Tk's mainloop() returns at once when there is no window
+        self.running = True
+        while self.running:
+            self.tcl.tk.dooneevent(0)
+
+    def quit(self):
+        self.running = False
+
+    def withdraw(self):
+        pass
+
+    def destroy(self):
+        pass
+
+
+make_root = tk.Tk
+
+
+def run_for(root, seconds):
+    """Run root's mainloop for a number of seconds."""
+    root.after(int(seconds * 1000), root.quit)
+    root.mainloop()
+
+
+def idle_cpu(seconds, mode):
+    """
+    Fraction of one core used while the window is idle.
+
+    Args:
+        seconds (float): How long to stay idle
+        mode (str): 'plain', 'queue' or 'bridge'
+    """
+    root = make_root()
+    root.withdraw()
+    bridge = None
+    if mode == 'queue':
+        results = queue.Queue()
+
+        def poll():
+            while not results.empty():
+                results.get_nowait()
+            root.after(POLL_INTERVAL, poll)
+        poll()
+    elif mode == 'bridge':
+        bridge = TkAsyncio(root)
+        bridge.wake()
+
+    run_for(root, 0.5)      # let start-up work settle
+    wall, cpu = time.perf_counter(), time.process_time()
+    run_for(root, seconds)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    if bridge is not None:
+        bridge.close()
+    root.destroy()
+    return cpu / wall
+
+
+def queue_latency(round_trips):
+    """Thread per task, result posted to a queue polled with root.after()."""
+    root = make_root()
+    root.withdraw()
+    histogram = LatencyHistogram()
+    results = queue.Queue()
+    state = {'sent': 0, 'started': 0.0}
+
+    def send():
+        state['started'] = time.perf_counter()
+        state['sent'] += 1
+        threading.Thread(target=lambda: results.put(time.sleep(0)), daemon=True).start()
+
+    def poll():
+        while not results.empty():
+            results.get_nowait()
+            histogram.record(int((time.perf_counter() - state['started']) * 1e9))
+            if state['sent'] >= round_trips:
+                root.quit()
+                return
+            send()
+        root.after(POLL_INTERVAL, poll)
+
+    send()
+    poll()
+    root.mainloop()
+    root.destroy()
+    return histogram
+
+
+def bridge_latency(round_trips):
+    """bridge.submit(bridge.run_blocking(...)) with a UI-thread callback."""
+    root = make_root()
+    root.withdraw()
+    bridge = TkAsyncio(root)
+    histogram = LatencyHistogram()
+    state = {'sent': 0, 'started': 0.0}
+
+    def send():
+        state['started'] = time.perf_counter()
+        state['sent'] += 1
+        bridge.submit(bridge.run_blocking(time.sleep, 0), callback=received)
+
+    def received(result):
+        histogram.record(int((time.perf_counter() - state['started']) * 1e9))
+        if state['sent'] >= round_trips:
+            root.quit()
+        else:
+            # Send from a fresh Tk event, not from inside the asyncio step
+            root.after_idle(send)
+
+    root.after_idle(send)
+    bridge.run()
+    root.destroy()
+    return histogram
+
+
+def main():
+    global make_root
+    args = [arg for arg in sys.argv[1:] if arg != '--no-display']
+    if len(args) != len(sys.argv) - 1:
+        make_root = TclRoot
+    seconds = float(args[0]) if len(args) > 0 else 5.0
+    round_trips = int(args[1]) if len(args) > 1 else 200
+
+    print(f"Idle CPU over {seconds:g} s (percent of one core)")
+    for mode, label in (('plain', 'plain mainloop'),
+                        ('queue', f'mainloop + queue poll ({POLL_INTERVAL} ms)'),
+                        ('bridge', 'TkAsyncio')):
+        print(f"  {label:<36} {idle_cpu(seconds, mode) * 100:6.2f}%")
+
+    print(f"\nResult latency over {round_trips} round trips (ms)")
+    print(f"  {'':<36} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    for label, histogram in (('thread + queue poll', queue_latency(round_trips)),
+                             ('TkAsyncio run_blocking', bridge_latency(round_trips))):
+        row = [histogram.percentile(p) * 1000 for p in (50, 90, 99)] + [histogram.max_micros / 1000]
+        print(f"  {label:<36} " + " ".join(f"{value:8.3f}" for value in row))
+
+
+if __name__ == "__main__":
+    main()
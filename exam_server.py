@@ -0,0 +1,366 @@
+"""
+Maths Quiz Exam Server
+A localhost asyncio server that runs quiz sessions for a whole room.
+
+Clients talk newline-delimited JSON over TCP. Every request is one object
+with an "op" field and gets exactly one object back:
+
+    {"op": "start", "student": "Ana", "difficulty": "easy"}
+        -> {"ok": true, "session": "...", "total": 10, "question": {"number": 1, "text": "3 + 4"}}
+    {"op": "answer", "session": "...", "answer": "7"}
+        -> {"ok": true, "correct": true, "points": 10, "score": 10, "retry": false,
+            "correct_answer": null, "question": {...} or null, "finished": false}
+    {"op": "leaderboard", "difficulty": "easy"}
+        -> {"ok": true, "leaderboard": [["Ana", 100, "..."], ...]}
+    {"op": "stats"}
+        -> {"ok": true, "sessions": 12, "started": 40, "finished": 28}
+
+Errors come back as {"ok": false, "error": "..."}.
+
+Scoring follows the desktop quiz: 10 points on the first try, 5 on the
+second, and the answer is revealed after two wrong tries. Each session
+holds only its fixed question set and a few counters, request lines are
+capped at MAX_LINE bytes, the number of live sessions is capped, and
+idle sessions are reaped, so memory stays bounded however many clients
+connect. Finished sessions go into a ResultsStore for a central
+leaderboard. The store appends and fsyncs on a single writer thread, so
+a batched fsync never stalls the event loop; leaderboards are read from
+its in-memory indexes.
+
+Usage:
+    python exam_server.py [--host 127.0.0.1] [--port 8765] [--seed EXAM]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from quiz_operators import OPERATORS, DIFFICULTY_RANGES
+from quiz_results import ResultsStore
+
+HOST = "127.0.0.1"
+PORT = 8765
+QUESTIONS_PER_EXAM = 10
+EXAM_OPERATORS = ('+', '-')
+MAX_SESSIONS = 2000
+MAX_LINE = 4096
+SESSION_TIMEOUT = 30 * 60
+REAP_INTERVAL = 30
+RESULTS_DIR = Path(__file__).resolve().parent / "exam_results"
+
+
+def make_question_set(difficulty, count=QUESTIONS_PER_EXAM, rng=random):
+    """
+    Generate a fixed list of questions with their answers.
+
+    Args:
+        difficulty (str): Key of DIFFICULTY_RANGES
+        count (int): Number of questions
+        rng (random.Random): Source of randomness for operators and operands
+
+    Returns:
+        tuple: (question_text, answer) pairs
+    """
+    low, high = DIFFICULTY_RANGES[difficulty]
+    draw = lambda: rng.randint(low, high)
+    return tuple(
+        OPERATORS[rng.choice(EXAM_OPERATORS)].generate(draw)
+        for _ in range(count)
+    )
+
+
+class ExamSession:
+    """State of one student's exam: questions, position and score."""
+
+    __slots__ = ('session_id', 'student', 'difficulty', 'questions',
+                 'index', 'attempts', 'score', 'last_seen')
+
+    def __init__(self, session_id, student, difficulty, questions):
+        self.session_id = session_id
+        self.student = student
+        self.difficulty = difficulty
+        self.questions = questions
+        self.index = 0
+        self.attempts = 0
+        self.score = 0
+        self.last_seen = time.monotonic()
+
+    def current_question(self):
+        """Return the current question for the client, or None when finished."""
+        if self.index >= len(self.questions):
+            return None
+        return {'number': self.index + 1, 'text': self.questions[self.index][0]}
+
+    def answer(self, text):
+        """
+        Mark an answer to the current question and advance if resolved.
+
+        Args:
+            text (str): Answer as typed by the student
+
+        Returns:
+            dict: Outcome for the client
+        """
+        self.last_seen = time.monotonic()
+        answer = self.questions[self.index][1]
+        try:
+            correct = int(text) == answer
+        except (TypeError, ValueError):
+            correct = False
+
+        points = 0
+        reveal = None
+        retry = False
+        if correct:
+            points = 10 if self.attempts == 0 else 5
+            self.score += points
+        else:
+            self.attempts += 1
+            if self.attempts == 1:
+                retry = True
+            else:
+                reveal = answer
+
+        if not retry:
+            self.index += 1
+            self.attempts = 0
+
+        return {
+            'ok': True,
+            'correct': correct,
+            'points': points,
+            'score': self.score,
+            'retry': retry,
+            'correct_answer': reveal,
+            'question': self.current_question(),
+            'finished': self.index >= len(self.questions)
+        }
+
+
+class ExamServer:
+    """
+    Serves exam sessions to many concurrent clients.
+
+    Attributes:
+        sessions (dict): session id -> ExamSession for live sessions
+    """
+
+    def __init__(self, results=None, seed=None, max_sessions=MAX_SESSIONS,
+                 session_timeout=SESSION_TIMEOUT):
+        """
+        Args:
+            results (ResultsStore, optional): Where finished sessions are recorded
+            seed (str, optional): Give every student the same questions per difficulty
+            max_sessions (int): Maximum number of live sessions
+            session_timeout (float): Seconds of inactivity before a session is dropped
+        """
+        self.results = results
+        self.seed = seed
+        self.max_sessions = max_sessions
+        self.session_timeout = session_timeout
+        self.sessions = {}
+        self.started = 0
+        self.finished = 0
+        # One thread keeps results in order and the store single-writer
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="results-writer") \
+            if results is not None else None
+
+    def start_session(self, request):
+        """Create a session and return its first question."""
+        difficulty = request.get('difficulty')
+        if not isinstance(difficulty, str) or difficulty not in DIFFICULTY_RANGES:
+            return {'ok': False, 'error': f"unknown difficulty: {difficulty}"}
+        if len(self.sessions) >= self.max_sessions:
+            return {'ok': False, 'error': "server full, try again later"}
+
+        student = str(request.get('student') or "guest")[:64]
+        rng = random.Random(f"{self.seed}-{difficulty}") if self.seed else random
+        session = ExamSession(secrets.token_hex(8), student, difficulty,
+                              make_question_set(difficulty, rng=rng))
+        self.sessions[session.session_id] = session
+        self.started += 1
+        return {
+            'ok': True,
+            'session': session.session_id,
+            'total': len(session.questions),
+            'question': session.current_question()
+        }
+
+    def answer(self, request):
+        """Mark an answer for a session and finish it after the last question."""
+        session_id = request.get('session')
+        if not isinstance(session_id, str):
+            return {'ok': False, 'error': "session must be a string"}
+        session = self.sessions.get(session_id)
+        if session is None:
+            return {'ok': False, 'error': "unknown or expired session"}
+
+        reply = session.answer(request.get('answer'))
+        if reply['finished']:
+            del self.sessions[session.session_id]
+            self.finished += 1
+            if self.writer is not None:
+                self.writer.submit(self.record_result, session.student,
+                                   session.difficulty, session.score)
+        return reply
+
+    def record_result(self, student, difficulty, score):
+        """Write a finished session to the results store (writer thread)."""
+        try:
+            self.results.add_result(student, difficulty, score)
+        except OSError as e:
+            print(f"Could not record result for {student}: {e}")
+
+    def close(self):
+        """Wait for queued results to be written."""
+        if self.writer is not None:
+            self.writer.shutdown(wait=True)
+
+    def handle_request(self, request):
+        """
+        Dispatch one decoded request.
+
+        Args:
+            request (dict): Parsed JSON request
+
+        Returns:
+            dict: Reply to send back
+        """
+        op = request.get('op')
+        if op == 'start':
+            return self.start_session(request)
+        if op == 'answer':
+            return self.answer(request)
+        if op == 'leaderboard':
+            if not isinstance(request.get('difficulty'), str):
+                return {'ok': False, 'error': "difficulty must be a string"}
+            if self.results is None:
+                return {'ok': True, 'leaderboard': []}
+            return {'ok': True, 'leaderboard': self.results.leaderboard(request.get('difficulty'))}
+        if op == 'stats':
+            return {'ok': True, 'sessions': len(self.sessions),
+                    'started': self.started, 'finished': self.finished}
+        return {'ok': False, 'error': f"unknown op: {op}"}
+
+    async def handle_client(self, reader, writer):
+        """Serve requests from one connection until it closes."""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(b'{"ok": false, "error": "request too long"}\n')
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    reply = self.handle_request(request) if isinstance(request, dict) \
+                        else {'ok': False, 'error': "request must be an object"}
+                except ValueError:
+                    reply = {'ok': False, 'error': "invalid JSON"}
+                writer.write((json.dumps(reply) + '\n').encode('utf-8'))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def reap_idle_sessions(self):
+        """Periodically drop sessions nobody has touched for a while."""
+        while True:
+            await asyncio.sleep(REAP_INTERVAL)
+            cutoff = time.monotonic() - self.session_timeout
+            for session_id in [key for key, session in self.sessions.items()
+                               if session.last_seen < cutoff]:
+                del self.sessions[session_id]
+
+    async def serve(self, host=HOST, port=PORT):
+        """Run the server until cancelled."""
+        server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE)
+        reaper = asyncio.create_task(self.reap_idle_sessions())
+        print(f"Exam server listening on {host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            reaper.cancel()
+
+
+class ExamClient:
+    """
+    Small blocking client for the exam server, used by the Tk quiz.
+
+    Each call is a single round trip that can wait up to `timeout`
+    seconds, so the quiz makes them through TkAsyncio.run_blocking()
+    and never on the UI thread. One request is in flight at a time.
+    """
+
+    def __init__(self, host=HOST, port=PORT, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.stream = self.sock.makefile('rwb')
+        self.session = None
+
+    def request(self, **request):
+        """
+        Send one request and wait for its reply.
+
+        Raises:
+            ConnectionError: If the server closed the connection
+            RuntimeError: If the server replied with an error
+        """
+        self.stream.write((json.dumps(request) + '\n').encode('utf-8'))
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("exam server closed the connection")
+        reply = json.loads(line)
+        if not reply.get('ok'):
+            raise RuntimeError(reply.get('error', "exam server error"))
+        return reply
+
+    def start(self, student, difficulty):
+        """Start a session and return the server's reply (with the first question)."""
+        reply = self.request(op='start', student=student, difficulty=difficulty)
+        self.session = reply['session']
+        return reply
+
+    def answer(self, text):
+        """Submit an answer for the current session."""
+        return self.request(op='answer', session=self.session, answer=text)
+
+    def leaderboard(self, difficulty):
+        """Best results for a difficulty across the whole room."""
+        return self.request(op='leaderboard', difficulty=difficulty)['leaderboard']
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Maths Quiz exams on the local network")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--seed', help="give every student the same questions")
+    args = parser.parse_args()
+
+    results = ResultsStore(RESULTS_DIR)
+    exam = ExamServer(results, seed=args.seed)
+    try:
+        asyncio.run(exam.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        exam.close()
+        results.close()
+
+
+if __name__ == "__main__":
+    main()
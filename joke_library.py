@@ -0,0 +1,308 @@
+"""
+Sharded Joke Library
+Jokes split across category files, loaded only when a category is used.
+
+Shards are found through the AssetResolver (bundle or resources folder):
+
+    A1 - Resources/
+    ├── randomJokes.txt          # the original file, category "Random"
+    └── Jokes/
+        ├── puns.txt             # category "Puns"
+        ├── tech.txt             # category "Tech"
+        └── kids.txt             # category "Kids"
+
+A shard uses the randomJokes.txt format: one "setup?punchline" joke per
+line, after a count header, "# jokes: 120". At startup only that header
+is read, so start-up cost does not depend on how much content ships.
+`python joke_library.py index` writes or corrects the header of every
+shard in the resources folder; run it after editing a shard (and before
+packing the bundle). A shard without a header is streamed once and
+counted by the same rule parse_jokes uses.
+
+A category's jokes are decoded the first time it is asked for. Loaded
+shards are kept in least-recently-used order and the coldest are
+dropped once their estimated size exceeds the memory budget (the shard
+just asked for is always kept).
+
+"All" picks a joke from the shards already in memory, each weighted by
+its size, so a pick on the UI thread never loads or evicts anything.
+next_prefetch() names a shard that is not resident and is expected to
+fit in what is left of the budget (weighted by its count) for the caller
+to load in the background, so prefetching fills memory but never evicts.
+When every shard fits, every joke is equally likely. Only the very first
+pick, with nothing resident yet, loads a shard itself.
+
+Usage:
+    python joke_library.py              # list categories and counts
+    python joke_library.py index        # write the count headers
+"""
+
+import os
+import random
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from asset_bundle import AssetResolver, RESOURCES_DIR
+
+LEGACY_SHARD = "randomJokes.txt"
+SHARD_DIR = "Jokes/"
+ALL = "All"
+HEADER = b"# jokes:"
+MEMORY_BUDGET = 2 * 1024 * 1024
+
+
+class Shard:
+    """
+    One category file.
+
+    Attributes:
+        category (str): Name shown in the selector
+        asset (str): Asset name of the file
+        count (int): Jokes in the file (from the header until loaded)
+    """
+
+    __slots__ = ('category', 'asset', 'count')
+
+    def __init__(self, category, asset, count):
+        self.category = category
+        self.asset = asset
+        self.count = count
+
+
+def category_for(asset):
+    """Category name for a shard asset, e.g. "Jokes/tech_support.txt" -> "Tech Support"."""
+    if asset == LEGACY_SHARD:
+        return "Random"
+    stem = asset.rsplit('/', 1)[-1].rsplit('.', 1)[0]
+    return stem.replace('_', ' ').replace('-', ' ').title()
+
+
+def header_count(head):
+    """
+    Joke count from a shard's "# jokes: N" header.
+
+    Args:
+        head (bytes): Start of the shard
+
+    Returns:
+        int: The count, or None if there is no valid header
+    """
+    if head.startswith(HEADER):
+        try:
+            return int(head[len(HEADER):].split(b'\n', 1)[0])
+        except ValueError:
+            pass
+    return None
+
+
+def is_joke(line):
+    """Whether a stripped line is a joke (the rule parse_jokes uses)."""
+    return bool(line) and '?' in line and not line.startswith('#')
+
+
+def count_jokes(file):
+    """Jokes in an undecoded shard, streamed line by line from a binary file."""
+    return sum(1 for raw in file if is_joke(raw.strip().decode('ascii', 'replace')))
+
+
+def parse_jokes(text):
+    """Jokes in a shard: non-empty, non-header lines that contain a question mark."""
+    return [line for line in (raw.strip() for raw in text.splitlines()) if is_joke(line)]
+
+
+def jokes_size(jokes):
+    """Approximate memory held by a list of jokes."""
+    return sys.getsizeof(jokes) + sum(sys.getsizeof(joke) for joke in jokes)
+
+
+class JokeLibrary:
+    """
+    Category shards with lazy loading and a memory budget.
+
+    Safe to use from a worker thread (e.g. TkAsyncio.run_blocking) while
+    the UI thread picks jokes.
+
+    Attributes:
+        shards (dict): category -> Shard, in display order
+        loads (int): Shards decoded so far
+        evictions (int): Shards dropped to stay within the budget
+    """
+
+    def __init__(self, assets=None, budget=MEMORY_BUDGET):
+        """
+        Args:
+            assets (AssetResolver, optional): Where shards are read from
+            budget (int): Bytes of decoded jokes to keep resident
+        """
+        self.assets = assets or AssetResolver()
+        self.budget = budget
+        self.shards = {}
+        self.loaded = OrderedDict()     # category -> list of jokes, coldest first
+        self.sizes = {}
+        self.resident = 0
+        self.loads = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.discover()
+
+    def discover(self):
+        """Find the shards and read their counts."""
+        assets = self.assets.names(SHARD_DIR)
+        if self.assets.exists(LEGACY_SHARD):
+            assets.insert(0, LEGACY_SHARD)
+        for asset in assets:
+            if not asset.endswith('.txt'):
+                continue
+            try:
+                count = header_count(self.assets.read_head(asset, 64))
+                if count is None:
+                    with self.assets.open(asset) as file:
+                        count = count_jokes(file)
+            except OSError as e:
+                print(f"Skipped joke shard {asset}: {e}")
+                continue
+            if count:
+                shard = Shard(category_for(asset), asset, count)
+                self.shards[shard.category] = shard
+
+    def categories(self):
+        """Names for the category selector, "All" first."""
+        return [ALL] + list(self.shards)
+
+    def total(self):
+        """Jokes across all shards (approximate until each is loaded)."""
+        return sum(shard.count for shard in self.shards.values())
+
+    def jokes(self, category):
+        """
+        Jokes of one category, loading the shard if it is not resident.
+
+        Raises:
+            KeyError: If there is no such category
+        """
+        with self.lock:
+            if category in self.loaded:
+                self.loaded.move_to_end(category)
+                return self.loaded[category]
+
+        shard = self.shards[category]
+        try:
+            jokes = parse_jokes(self.assets.read_text(shard.asset))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Could not load joke shard {shard.asset}: {e}")
+            jokes = []
+
+        with self.lock:
+            if category not in self.loaded:
+                shard.count = len(jokes)
+                self.loaded[category] = jokes
+                self.sizes[category] = jokes_size(jokes)
+                self.resident += self.sizes[category]
+                self.loads += 1
+                self.evict()
+            self.loaded.move_to_end(category)
+            return self.loaded[category]
+
+    def evict(self):
+        """Drop the coldest shards until within budget; the caller holds the lock."""
+        while self.resident > self.budget and len(self.loaded) > 1:
+            category, _ = self.loaded.popitem(last=False)
+            self.resident -= self.sizes.pop(category)
+            self.evictions += 1
+
+    def random_joke(self, category=ALL):
+        """
+        A random joke from a category, or from the resident shards for "All".
+
+        Returns:
+            str: The joke, or None if the category has none
+        """
+        if category != ALL:
+            jokes = self.jokes(category)
+            return random.choice(jokes) if jokes else None
+
+        with self.lock:
+            resident = [jokes for jokes in self.loaded.values() if jokes]
+        if resident:
+            return random.choice(random.choices(resident, weights=[len(jokes) for jokes in resident])[0])
+
+        # Nothing loaded yet. A stale header can promise jokes a shard does
+        # not have; loading corrects its count, so try the others first
+        shards = [shard for shard in self.shards.values() if shard.count]
+        while shards:
+            shard = random.choices(shards, weights=[shard.count for shard in shards])[0]
+            jokes = self.jokes(shard.category)
+            if jokes:
+                return random.choice(jokes)
+            shards.remove(shard)
+        return None
+
+    def next_prefetch(self):
+        """
+        A shard worth loading in the background for "All".
+
+        Sizes are estimated from the resident shards' bytes per joke, and
+        shards that would push the library over budget are skipped.
+
+        Returns:
+            str: Category of a shard to load, or None if none would fit
+        """
+        with self.lock:
+            loaded_jokes = sum(len(jokes) for jokes in self.loaded.values())
+            per_joke = self.resident / loaded_jokes if loaded_jokes else 0
+            free = self.budget - self.resident
+            shards = [shard for shard in self.shards.values()
+                      if shard.count and shard.category not in self.loaded
+                      and shard.count * per_joke <= free]
+        if not shards:
+            return None
+        return random.choices(shards, weights=[shard.count for shard in shards])[0].category
+
+    def stats(self):
+        """Loads, evictions and resident size for the status line or logs."""
+        with self.lock:
+            return {'loaded': list(self.loaded), 'resident': self.resident,
+                    'loads': self.loads, 'evictions': self.evictions}
+
+
+def write_header(path):
+    """
+    Give a shard file a correct "# jokes: N" header.
+
+    Returns:
+        int: The joke count
+    """
+    lines = path.read_text(encoding='utf-8').splitlines()
+    if lines and header_count(lines[0].encode('utf-8')) is not None:
+        lines = lines[1:]
+    count = sum(1 for line in lines if is_joke(line.strip()))
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_text("\n".join([f"{HEADER.decode()} {count}"] + lines) + "\n", encoding='utf-8')
+    os.replace(temp_path, path)
+    return count
+
+
+def index(resources_dir=RESOURCES_DIR):
+    """Write the count header of every shard in the resources folder."""
+    resources_dir = Path(resources_dir)
+    paths = sorted((resources_dir / SHARD_DIR).glob('*.txt'))
+    if (resources_dir / LEGACY_SHARD).is_file():
+        paths.insert(0, resources_dir / LEGACY_SHARD)
+    for path in paths:
+        print(f"{write_header(path):>7}  {path.relative_to(resources_dir).as_posix()}")
+
+
+def main():
+    if sys.argv[1:] == ['index']:
+        index()
+        return
+    library = JokeLibrary()
+    for category, shard in library.shards.items():
+        print(f"{shard.count:>7}  {category:<20} {shard.asset}")
+    print(f"{library.total():>7}  jokes in {len(library.shards)} categories")
+
+
+if __name__ == "__main__":
+    main()
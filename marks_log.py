@@ -0,0 +1,397 @@
+"""
+Marks Update Log
+Single-student edits to studentMarks.txt without rewriting the file.
+
+Adds, updates and deletes are appended as JSON lines to a sidecar log
+("<file>.log") and synced, so each edit costs one small append however
+large the class is:
+
+    {"op": "upsert", "number": 8439, "exam": 52}
+    {"op": "upsert", "number": 1111, "name": "New Student", "cw1": 10, "cw2": 12, "cw3": 9, "exam": 60}
+    {"op": "delete", "number": 2344}
+
+An upsert may carry only the fields that change. load_current() reads the
+canonical file and applies the log on top. compact() folds the log into
+the canonical file (header count included) through a temporary file and
+an atomic rename, then keeps only log entries written after compaction
+began. The canonical file therefore always stays in the plain format
+that other tools read.
+
+Several processes may edit one file (quiz windows in a lab, a teacher's
+tool). Appends and compaction hold an exclusive lock on "<file>.lock",
+so an entry can never land in a log that another process is replacing.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from student_marks import (MARKS_FILE, MAX_COURSEWORK, MAX_EXAM, MAX_CODE, MIN_CODE,
+                           MarksFileError, StudentMarks, load_marks, save_marks)
+
+MARK_FIELDS = ('cw1', 'cw2', 'cw3', 'exam')
+RECORD_FIELDS = ('name',) + MARK_FIELDS
+COMPACT_AFTER = 1000
+
+
+def log_path_for(marks_path):
+    """Sidecar log file for a marks file."""
+    marks_path = Path(marks_path)
+    return marks_path.with_name(marks_path.name + ".log")
+
+
+def lock_path_for(path):
+    """Lock file guarding a marks file (or any other shared file)."""
+    path = Path(path)
+    return path.with_name(path.name + ".lock")
+
+
+@contextmanager
+def locked(lock_path):
+    """
+    Hold an exclusive, cross-process lock on a lock file.
+
+    Args:
+        lock_path (Path): Lock file (created if missing)
+    """
+    with open(lock_path, 'a+b') as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            # LK_LOCK retries for about 10 seconds, keep waiting beyond that
+            while True:
+                try:
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def check_fields(fields):
+    """
+    Validate the fields of an upsert.
+
+    Raises:
+        MarksFileError: If a field is unknown or a mark is out of range
+    """
+    for field, value in fields.items():
+        if field == 'name':
+            if not isinstance(value, str) or not value.strip() or ',' in value or '\n' in value:
+                raise MarksFileError("name must be non-empty and contain no commas or newlines")
+        elif field in MARK_FIELDS:
+            limit = MAX_EXAM if field == 'exam' else MAX_COURSEWORK
+            if not isinstance(value, int) or not 0 <= value <= limit:
+                raise MarksFileError(f"{field} must be a whole number from 0 to {limit}")
+        else:
+            raise MarksFileError(f"unknown field: {field}")
+
+
+def fold_entries(entries):
+    """
+    Collapse log entries into one pending change per student.
+
+    Args:
+        entries (iterable): Decoded log entries, oldest first
+
+    Returns:
+        dict: number -> None (deleted) or (replaces_row, fields)
+    """
+    pending = {}
+    for entry in entries:
+        number = entry['number']
+        if entry['op'] == 'delete':
+            pending[number] = None
+            continue
+        fields = {key: entry[key] for key in RECORD_FIELDS if key in entry}
+        change = pending.get(number, (False, {}))
+        if change is None:
+            # Re-added after a delete: do not merge with the old row
+            change = (True, {})
+        change[1].update(fields)
+        pending[number] = change
+    return pending
+
+
+def apply_pending(marks, pending):
+    """
+    Build a new column store with pending changes applied.
+
+    Args:
+        marks (StudentMarks): Canonical rows
+        pending (dict): Output of fold_entries
+
+    Returns:
+        StudentMarks: Rows in file order, new students appended at the end
+    """
+    if not pending:
+        return marks
+    pending = dict(pending)
+    result = StudentMarks()
+    for index in range(len(marks)):
+        number = marks.numbers[index]
+        row = {
+            'name': marks.name(index), 'cw1': marks.coursework1[index],
+            'cw2': marks.coursework2[index], 'cw3': marks.coursework3[index],
+            'exam': marks.exam[index]
+        }
+        if number in pending:
+            change = pending.pop(number)
+            if change is None:
+                continue
+            replaces_row, fields = change
+            if replaces_row:
+                if not all(field in fields for field in RECORD_FIELDS):
+                    continue
+                row = {}
+            row.update(fields)
+        result.append_row(number, row['name'].encode('utf-8'),
+                          row['cw1'], row['cw2'], row['cw3'], row['exam'])
+
+    for number, change in pending.items():
+        if change is None:
+            continue
+        fields = change[1]
+        if all(field in fields for field in RECORD_FIELDS):
+            result.append_row(number, fields['name'].encode('utf-8'),
+                              fields['cw1'], fields['cw2'], fields['cw3'], fields['exam'])
+        else:
+            print(f"Skipped update for unknown student {number}")
+    result.declared_count = len(result)
+    return result
+
+
+def upsert_entry(number, **fields):
+    """
+    Build a validated upsert entry without writing it.
+
+    Args:
+        number (int): Student code
+        **fields: Any of name, cw1, cw2, cw3, exam
+
+    Returns:
+        dict: Entry for MarksLog.append / append_many
+
+    Raises:
+        MarksFileError: If a field or the student code is invalid
+    """
+    check_fields(fields)
+    number = int(number)
+    if not MIN_CODE <= number <= MAX_CODE:
+        raise MarksFileError(f"student code {number} is out of range")
+    return dict(op='upsert', number=number, **fields)
+
+
+class MarksLog:
+    """
+    Append-only edit log next to a marks file, with background compaction.
+    """
+
+    def __init__(self, marks_path=MARKS_FILE, compact_after=COMPACT_AFTER):
+        """
+        Args:
+            marks_path (Path): Canonical marks file
+            compact_after (int): Log entries that trigger a background compaction (0 = never)
+        """
+        self.marks_path = Path(marks_path)
+        self.log_path = log_path_for(self.marks_path)
+        self.lock_path = lock_path_for(self.marks_path)
+        self.compact_after = compact_after
+        self.lock = threading.Lock()
+        self.compact_lock = threading.Lock()
+        self.file_lock = threading.RLock()
+        self.file_lock_depth = 0
+        self.compacting = None
+        self.drop_torn_tail()
+        self.entries = self.count_entries()
+
+    @contextmanager
+    def exclusive(self):
+        """
+        Hold the cross-process lock on the marks file.
+
+        Re-entrant within this process, so a caller that batches several
+        operations (MarksExporter.flush) can hold it around append_many()
+        and compact(), which take it themselves. Take it before self.lock.
+        """
+        with self.file_lock:
+            self.file_lock_depth += 1
+            try:
+                if self.file_lock_depth == 1:
+                    with locked(self.lock_path):
+                        yield
+                else:
+                    yield
+            finally:
+                self.file_lock_depth -= 1
+
+    def drop_torn_tail(self):
+        """Cut off a final line left half-written by a crash."""
+        with self.exclusive():
+            try:
+                with open(self.log_path, 'rb+') as file:
+                    data = file.read()
+                    if data and not data.endswith(b'\n'):
+                        file.truncate(data.rfind(b'\n') + 1)
+                        print("Dropped incomplete marks log entry")
+            except FileNotFoundError:
+                pass
+
+    def count_entries(self):
+        """Number of entries currently in the log file."""
+        try:
+            with open(self.log_path, 'rb') as file:
+                return sum(1 for line in file if line.strip())
+        except FileNotFoundError:
+            return 0
+
+    def read_entries(self, limit=None):
+        """
+        Read log entries, skipping a torn final line.
+
+        Args:
+            limit (int, optional): Only read this many bytes of the log
+
+        Returns:
+            list: Decoded entries, oldest first
+        """
+        try:
+            with open(self.log_path, 'rb') as file:
+                data = file.read() if limit is None else file.read(limit)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in data.split(b'\n'):
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                print("Skipped unreadable marks log entry")
+        return entries
+
+    def append(self, entry):
+        """Append and sync one entry, then compact if the log has grown large."""
+        self.append_many([entry])
+
+    def append_many(self, entries):
+        """
+        Append several entries with a single write and sync.
+
+        Args:
+            entries (list): Entries as built by upsert_entry / delete
+        """
+        data = b''.join((json.dumps(entry) + '\n').encode('utf-8') for entry in entries)
+        with self.exclusive(), self.lock:
+            with open(self.log_path, 'ab') as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            self.entries += len(entries)
+        if self.compact_after and self.entries >= self.compact_after:
+            self.compact_in_background()
+
+    def upsert(self, number, **fields):
+        """
+        Add a student or change some of their fields.
+
+        Args:
+            number (int): Student code
+            **fields: Any of name, cw1, cw2, cw3, exam
+        """
+        self.append(upsert_entry(number, **fields))
+
+    def delete(self, number):
+        """
+        Remove a student.
+
+        Args:
+            number (int): Student code
+        """
+        self.append({'op': 'delete', 'number': int(number)})
+
+    def load_current(self):
+        """
+        Canonical marks with the log applied.
+
+        Returns:
+            StudentMarks: Up-to-date rows
+        """
+        with self.lock:
+            marks = load_marks(self.marks_path, strict=False)
+            entries = self.read_entries()
+        return apply_pending(marks, fold_entries(entries))
+
+    def compact(self):
+        """
+        Fold the log into the canonical file.
+
+        Entries appended while the canonical file is being rewritten are
+        carried over into the new log rather than lost.
+        """
+        with self.exclusive(), self.compact_lock:
+            self.compact_locked()
+
+    def compact_locked(self):
+        """Body of compact(); the caller holds compact_lock and the file lock."""
+        with self.lock:
+            try:
+                covered = self.log_path.stat().st_size
+            except FileNotFoundError:
+                return
+            marks = load_marks(self.marks_path, strict=False)
+            entries = self.read_entries(covered)
+
+        # The file lock is held throughout: another process compacting at
+        # the same time could otherwise replace the canonical file or the
+        # log between these steps. Readers in this window may apply the
+        # old log to the new file, which is harmless because every entry
+        # is idempotent.
+        save_marks(apply_pending(marks, fold_entries(entries)), self.marks_path)
+
+        with self.lock:
+            with open(self.log_path, 'rb') as file:
+                file.seek(covered)
+                tail = file.read()
+            temp_path = self.log_path.with_name(self.log_path.name + ".tmp")
+            with open(temp_path, 'wb') as file:
+                file.write(tail)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.log_path)
+            self.entries = sum(1 for line in tail.split(b'\n') if line.strip())
+
+    def compact_in_background(self):
+        """
+        Start compact() on a daemon thread unless one is already running.
+
+        Returns:
+            threading.Thread: The running compaction thread
+        """
+        with self.lock:
+            if self.compacting is not None and self.compacting.is_alive():
+                return self.compacting
+            self.compacting = threading.Thread(target=self.compact, name="marks-compact", daemon=True)
+            self.compacting.start()
+            return self.compacting
+
+    def wait(self):
+        """Block until a background compaction (if any) has finished."""
+        if self.compacting is not None:
+            self.compacting.join()
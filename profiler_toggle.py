@@ -0,0 +1,177 @@
+"""
+On-demand Profiler for the GUI Apps
+Starts and stops cProfile inside a running app, from the keyboard or with
+a signal, and writes what it caught to disk.
+
+    Control-F12                 toggle from the keyboard (not shown in the UI)
+    kill -USR1 <pid>            toggle from a shell (Unix)
+
+Each stop writes two files to profiles/:
+
+    <app>-20261019-142501-083512.prof  raw stats (python -m pstats, snakeviz, ...)
+    <app>-20261019-142501-083512.txt   top functions by cumulative and own time
+
+While off nothing is installed in the interpreter: no profiler, trace
+hook or polling timer. A Python signal handler alone would only run once
+Tk returns to Python for some other event, so the signal is turned into
+a byte on a pipe with signal.set_wakeup_fd() and Tk watches the pipe
+with createfilehandler(), waking the mainloop straight away.
+
+cProfile sees the Tk thread only; the asyncio bridge's worker threads
+are not included.
+
+Usage:
+    profiler = ProfilerToggle(root, "alexa_jokes")
+    profiler.install()
+    root.mainloop()
+    profiler.uninstall()
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import signal
+import threading
+import time
+import tkinter
+from datetime import datetime
+from pathlib import Path
+
+PROFILES_DIR = Path(__file__).resolve().parent / "profiles"
+KEY_BINDING = "<Control-F12>"
+TOP_FUNCTIONS = 30
+
+
+class ProfilerToggle:
+    """
+    Keyboard and SIGUSR1 switch for cProfile in a Tk app.
+
+    Attributes:
+        profile (cProfile.Profile): The running profiler, or None when off
+    """
+
+    def __init__(self, root, app_name, output_dir=PROFILES_DIR, top=TOP_FUNCTIONS):
+        """
+        Args:
+            root (tk.Tk): The app's root window
+            app_name (str): Used to name the dump files
+            output_dir (Path): Folder for dumps and summaries
+            top (int): Functions listed in each summary
+        """
+        self.root = root
+        self.app_name = app_name
+        self.output_dir = Path(output_dir)
+        self.top = top
+        self.profile = None
+        self.started = None
+        self.pipe = None
+        self.old_wakeup_fd = -1
+        self.old_handler = None
+        self.writers = []
+
+    def install(self):
+        """Bind the hidden key and, where supported, the SIGUSR1 handler."""
+        self.root.bind_all(KEY_BINDING, self.toggle)
+
+        # Signal -> pipe -> Tk file handler (Unix only, main thread only)
+        if not hasattr(signal, 'SIGUSR1') or not hasattr(self.root.tk, 'createfilehandler'):
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        self.pipe = (read_fd, write_fd)
+        self.old_wakeup_fd = signal.set_wakeup_fd(write_fd)
+        # The Python-level handler only stops SIGUSR1 from killing the
+        # process; the toggle happens in on_wakeup
+        self.old_handler = signal.signal(signal.SIGUSR1, lambda signum, frame: None)
+        self.root.tk.createfilehandler(read_fd, tkinter.READABLE, self.on_wakeup)
+
+    def on_wakeup(self, fd, mask):
+        """Tk file handler: read signal numbers written by the wakeup fd."""
+        try:
+            data = os.read(fd, 512)
+        except BlockingIOError:
+            return
+        for signum in data:
+            if signum == signal.SIGUSR1:
+                self.toggle()
+
+    def toggle(self, event=None):
+        """Start profiling if it is off, otherwise stop and write the results."""
+        if self.profile is None:
+            self.start()
+        else:
+            self.stop()
+
+    def start(self):
+        """Begin profiling the Tk thread."""
+        if self.profile is not None:
+            return
+        self.profile = cProfile.Profile()
+        self.started = datetime.now()
+        print(f"Profiler on ({self.app_name})")
+        self.profile.enable()
+
+    def stop(self):
+        """
+        Stop profiling and write the dump and summary on a background thread.
+
+        Returns:
+            Path: The .prof file being written, or None if profiling was off
+        """
+        if self.profile is None:
+            return None
+        self.profile.disable()
+        profile, started = self.profile, self.started
+        self.profile = None
+        elapsed = (datetime.now() - started).total_seconds()
+
+        # Microseconds keep two toggles within one second apart
+        path = self.output_dir / f"{self.app_name}-{started:%Y%m%d-%H%M%S-%f}.prof"
+        writer = threading.Thread(target=self.write, args=(profile, path, elapsed),
+                                  name="profile-writer")
+        writer.start()
+        self.writers = [thread for thread in self.writers if thread.is_alive()] + [writer]
+        print(f"Profiler off after {elapsed:.1f} s - writing {path.name}")
+        return path
+
+    def write(self, profile, path, elapsed):
+        """Dump raw stats and a text summary of the top functions."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(path)
+
+            summary = io.StringIO()
+            summary.write(f"{self.app_name}: {elapsed:.1f} s profiled, written {time.ctime()}\n\n")
+            stats = pstats.Stats(profile, stream=summary).strip_dirs()
+            summary.write(f"Top {self.top} by cumulative time\n")
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+            summary.write(f"Top {self.top} by own time\n")
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+            path.with_suffix('.txt').write_text(summary.getvalue(), encoding='utf-8')
+        except OSError as e:
+            print(f"Could not write profile: {e}")
+
+    def uninstall(self):
+        """Stop profiling (writing results), remove the handlers and wait for writers."""
+        self.stop()
+        try:
+            self.root.unbind_all(KEY_BINDING)
+        except Exception:
+            pass  # window already destroyed
+        if self.pipe is not None:
+            try:
+                self.root.tk.deletefilehandler(self.pipe[0])
+            except Exception:
+                pass
+            signal.set_wakeup_fd(self.old_wakeup_fd)
+            signal.signal(signal.SIGUSR1, self.old_handler)
+            for fd in self.pipe:
+                os.close(fd)
+            self.pipe = None
+        for writer in self.writers:
+            writer.join()
+        self.writers = []
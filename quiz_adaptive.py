@@ -0,0 +1,155 @@
+"""
+Adaptive Difficulty for the Maths Quiz
+Keeps a running skill estimate per student and picks the next question's
+number range and operators so the student succeeds about as often as
+TARGET_SUCCESS.
+
+Skill is an Elo-style rating updated once per answer, together with an
+exponential moving average of the success rate. Question tiers are laid
+out on the same rating scale at a fixed step, so choosing the next tier
+is a single subtraction and division rather than a search.
+
+The tiers' ratings are only approximate (a tier that adds division is
+not exactly one step harder for everyone), so when the recent success
+average drifts more than SUCCESS_MARGIN from the target the chosen tier
+is moved one step toward it.
+"""
+
+import math
+
+# (low, high, operators) from easiest to hardest. Tier i has rating
+# BASE_RATING + i * TIER_STEP. Operator symbols are keys of
+# quiz_operators.OPERATORS.
+TIERS = (
+    (0, 5, ('+',)),
+    (0, 9, ('+',)),
+    (0, 9, ('+', '-')),
+    (2, 9, ('×',)),
+    (10, 20, ('+', '-')),
+    (2, 12, ('×', '÷')),
+    (10, 50, ('+', '-')),
+    (10, 99, ('+', '-')),
+    (2, 12, ('×', '÷', '^')),
+    (100, 999, ('+', '-')),
+    (2, 20, ('mix',)),
+    (1000, 9999, ('+', '-')),
+)
+
+BASE_RATING = 800
+TIER_STEP = 100
+START_RATING = 1000
+TARGET_SUCCESS = 0.75
+SUCCESS_MARGIN = 0.15
+
+
+class SkillEstimate:
+    """
+    Incremental skill estimate for one student.
+
+    Both the rating and the success average are updated in O(1) per
+    answer and nothing about past answers is stored.
+    """
+
+    def __init__(self, rating=START_RATING, k_factor=48, smoothing=0.2):
+        """
+        Args:
+            rating (float): Starting Elo rating
+            k_factor (float): Maximum rating change per answer
+            smoothing (float): Weight of the newest answer in the success average
+        """
+        self.rating = rating
+        self.k_factor = k_factor
+        self.smoothing = smoothing
+        self.success_rate = TARGET_SUCCESS
+        self.answers = 0
+
+    def expected(self, question_rating):
+        """
+        Probability that the student answers a question of this rating.
+
+        Args:
+            question_rating (float): Rating of the question tier
+
+        Returns:
+            float: Expected score between 0 and 1
+        """
+        return 1.0 / (1.0 + 10 ** ((question_rating - self.rating) / 400))
+
+    def update(self, question_rating, score):
+        """
+        Fold one answer into the estimate.
+
+        Args:
+            question_rating (float): Rating of the tier the question came from
+            score (float): 1.0 for first-try correct, 0.5 for second try, 0.0 for wrong
+        """
+        self.rating += self.k_factor * (score - self.expected(question_rating))
+        self.success_rate += self.smoothing * (score - self.success_rate)
+        self.answers += 1
+
+
+class AdaptiveDifficulty:
+    """
+    Chooses question tiers from per-student skill estimates.
+
+    The rating offset that gives TARGET_SUCCESS under the Elo model is
+    computed once, so next_tier() is constant time.
+    """
+
+    def __init__(self, target_success=TARGET_SUCCESS):
+        """
+        Args:
+            target_success (float): Desired share of correct answers (0 < p < 1)
+        """
+        if not 0 < target_success < 1:
+            raise ValueError("target_success must be between 0 and 1")
+        self.target_success = target_success
+        # Solve expected(q) == target for q - rating
+        self.offset = 400 * math.log10(1 / target_success - 1)
+        self.students = {}
+        self.student = None
+        self.estimate = None
+        self.tier_index = 0
+        self.select_student("guest")
+
+    def select_student(self, name):
+        """
+        Switch to (or create) the skill estimate for a student.
+
+        Args:
+            name (str): Student identifier
+        """
+        self.student = name
+        self.estimate = self.students.get(name)
+        if self.estimate is None:
+            self.estimate = self.students[name] = SkillEstimate()
+
+    def next_tier(self):
+        """
+        Pick the tier for the next question.
+
+        Returns:
+            tuple: (low, high, operators) for the chosen tier
+        """
+        wanted = self.estimate.rating + self.offset
+        index = round((wanted - BASE_RATING) / TIER_STEP)
+        drift = self.estimate.success_rate - self.target_success
+        if drift > SUCCESS_MARGIN:
+            index += 1          # recent questions were too easy
+        elif drift < -SUCCESS_MARGIN:
+            index -= 1          # recent questions were too hard
+        self.tier_index = min(max(index, 0), len(TIERS) - 1)
+        return TIERS[self.tier_index]
+
+    def record(self, score):
+        """
+        Update the current student's estimate after an answer.
+
+        Args:
+            score (float): 1.0, 0.5 or 0.0 as for SkillEstimate.update
+        """
+        self.estimate.update(BASE_RATING + self.tier_index * TIER_STEP, score)
+
+    def level(self):
+        """Return the current tier as a 1-based level number for display."""
+        return self.tier_index + 1
@@ -0,0 +1,144 @@
+"""
+Quiz Results Export in the studentMarks.txt Format
+Records finished quizzes against a student code and writes them, in
+batches, into a marks file of their own (quiz_marks.txt next to this
+script by default). The class file in A1 - Resources holds real exam
+marks and is never written by the quiz.
+
+A quiz score (out of 100) goes in the exam column of a new row with zero
+coursework. A student who is already in the export file keeps their row
+as it is: the exam column of an existing row is never overwritten, so
+the file holds each student's first exported quiz. Results are held in
+memory and flushed when BATCH_SIZE students are waiting or
+FLUSH_INTERVAL seconds have passed since the oldest one, and always on
+close.
+
+A flush takes an exclusive lock on "<file>.lock" so several quiz windows
+(or lab machines sharing the file) can export at once. Inside the lock
+the batch is merged with the current marks (file plus pending log),
+appended to the marks log in one write, and compacted into the canonical
+file so its count header is correct when the lock is released.
+
+record() and flush() may be called from different threads, e.g. a quiz
+window queueing results while a worker thread flushes them.
+"""
+
+import threading
+import time
+from pathlib import Path
+
+from student_marks import MAX_EXAM, StudentMarks, save_marks
+from marks_log import MarksLog, upsert_entry
+
+QUIZ_MARKS_FILE = Path(__file__).resolve().parent / "quiz_marks.txt"
+BATCH_SIZE = 20
+FLUSH_INTERVAL = 30.0
+MIN_STUDENT_NUMBER = 1000
+MAX_STUDENT_NUMBER = 9999
+
+
+def valid_student_number(text):
+    """
+    Parse a student code typed by the user.
+
+    Args:
+        text (str): User input
+
+    Returns:
+        int: The code, or None if it is not a number from 1000 to 9999
+    """
+    try:
+        number = int(text)
+    except (TypeError, ValueError):
+        return None
+    if MIN_STUDENT_NUMBER <= number <= MAX_STUDENT_NUMBER:
+        return number
+    return None
+
+
+class MarksExporter:
+    """
+    Batches quiz results and merges them into a marks file.
+    """
+
+    def __init__(self, marks_path=QUIZ_MARKS_FILE, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        """
+        Args:
+            marks_path (Path): studentMarks.txt-format file to add quiz results to
+            batch_size (int): Results that trigger a flush
+            flush_interval (float): Seconds the oldest result may wait
+        """
+        self.marks_path = Path(marks_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.log = MarksLog(self.marks_path, compact_after=0)
+        self.pending = {}           # student code -> (name, score), latest wins
+        self.oldest = None
+        self.lock = threading.Lock()            # guards pending / oldest
+        self.flush_lock = threading.Lock()      # one flush at a time
+
+    def record(self, number, name, score):
+        """
+        Queue a result and flush if a threshold has been reached.
+
+        Args:
+            number (int): Student code
+            name (str): Student name (used only for new students)
+            score (int): Quiz score out of 100
+        """
+        name = " ".join(name.replace(',', ' ').split()) or "guest"
+        with self.lock:
+            self.pending[number] = (name, max(0, min(int(score), MAX_EXAM)))
+            if self.oldest is None:
+                self.oldest = time.monotonic()
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        """Flush when the batch is full or its oldest result is too old."""
+        with self.lock:
+            if not self.pending:
+                return
+            due = len(self.pending) >= self.batch_size or time.monotonic() - self.oldest >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """
+        Merge all queued results into the marks file.
+
+        Results stay queued if the write fails, so a later flush can retry.
+
+        Returns:
+            int: Number of students written
+        """
+        with self.flush_lock:
+            return self.flush_locked()
+
+    def flush_locked(self):
+        """Body of flush(); the caller holds flush_lock."""
+        with self.lock:
+            if not self.pending:
+                return 0
+            batch = dict(self.pending)
+        with self.log.exclusive():
+            if not self.marks_path.exists():
+                save_marks(StudentMarks(), self.marks_path)
+            current = self.log.load_current()
+            known = set(current.numbers)
+            # Existing rows keep their marks; only new students are added
+            entries = [upsert_entry(number, name=name, cw1=0, cw2=0, cw3=0, exam=score)
+                       for number, (name, score) in batch.items() if number not in known]
+            if entries:
+                self.log.append_many(entries)
+                self.log.compact()
+
+        with self.lock:
+            for number, result in batch.items():
+                if self.pending.get(number) == result:
+                    del self.pending[number]
+            self.oldest = time.monotonic() if self.pending else None
+        return len(batch)
+
+    def close(self):
+        """Flush anything still queued."""
+        self.flush()
@@ -0,0 +1,201 @@
+"""
+Operator Table for the Maths Quiz
+Each operator knows how to build its own question text and answer.
+
+An operator's generator is given a `draw` function that returns one random
+operand for the current difficulty (e.g. from exam_server) and returns the
+question text together with its answer, already computed. Constraints
+such as "no negative results" or "whole-number division" live in the
+generator, so the quiz itself only stores the answer and compares it.
+
+Operators can also describe their question space for an operand range:
+count(low, high) is the number of distinct questions and unrank(rank, low,
+high) builds question number `rank` (0 <= rank < count). quiz_questions
+uses these to hand out questions without repeats. An operator registered
+without them still works; it just gets no repeat guarantee.
+
+Adding an operator means writing a generator and calling register_operator;
+nothing in the quiz needs to change.
+"""
+
+import math
+import random
+
+# Operand ranges for the fixed difficulty levels
+DIFFICULTY_RANGES = {
+    'easy': (0, 9),
+    'moderate': (10, 99),
+    'advanced': (1000, 9999)
+}
+
+
+class Operator:
+    """
+    A quiz operator: its symbol, a display name and a question generator.
+
+    Attributes:
+        symbol (str): Key used in operator lists (e.g. '+')
+        name (str): Human readable name
+        generator (callable): draw -> (question_text, answer)
+        count (callable): (low, high) -> number of distinct questions, or None
+        unrank (callable): (rank, low, high) -> (question_text, answer), or None
+    """
+
+    def __init__(self, symbol, name, generator, count=None, unrank=None):
+        self.symbol = symbol
+        self.name = name
+        self.generator = generator
+        self.count = count
+        self.unrank = unrank
+
+    def generate(self, draw):
+        """
+        Build one question.
+
+        Args:
+            draw (callable): Returns a random operand for the current difficulty
+
+        Returns:
+            tuple: (question_text, answer)
+        """
+        return self.generator(draw)
+
+
+OPERATORS = {}
+
+
+def register_operator(symbol, name, generator, count=None, unrank=None):
+    """
+    Add an operator to the table (replacing any with the same symbol).
+
+    Args:
+        symbol (str): Key used in operator lists
+        name (str): Human readable name
+        generator (callable): draw -> (question_text, answer)
+        count (callable, optional): (low, high) -> number of distinct questions
+        unrank (callable, optional): (rank, low, high) -> (question_text, answer)
+
+    Returns:
+        Operator: The registered operator
+    """
+    operator = OPERATORS[symbol] = Operator(symbol, name, generator, count, unrank)
+    return operator
+
+
+def add_question(draw):
+    a, b = draw(), draw()
+    return f"{a} + {b}", a + b
+
+
+def subtract_question(draw):
+    a, b = draw(), draw()
+    # Larger number first so the answer is never negative
+    if a < b:
+        a, b = b, a
+    return f"{a} - {b}", a - b
+
+
+def multiply_question(draw):
+    a, b = draw(), draw()
+    return f"{a} × {b}", a * b
+
+
+def divide_question(draw):
+    # Build the dividend from divisor and quotient so it divides exactly
+    divisor = draw() or 1
+    quotient = draw()
+    return f"{divisor * quotient} ÷ {divisor}", quotient
+
+
+def power_question(draw):
+    base = draw()
+    exponent = random.choice((2, 3)) if base <= 12 else 2
+    return f"{base}^{exponent}", base ** exponent
+
+
+def mixed_question(draw):
+    # a ± b × c, answered with normal operator precedence
+    a, b, c = draw(), draw(), draw()
+    if random.randint(0, 1) == 0 or a < b * c:
+        return f"{a} + {b} × {c}", a + b * c
+    return f"{a} - {b} × {c}", a - b * c
+
+
+# Question spaces. Each rank maps to exactly one question the matching
+# generator can produce, and no two ranks give the same question text.
+
+def pair_count(low, high):
+    return (high - low + 1) ** 2
+
+
+def add_unrank(rank, low, high):
+    a, b = divmod(rank, high - low + 1)
+    return f"{low + a} + {low + b}", (low + a) + (low + b)
+
+
+def multiply_unrank(rank, low, high):
+    a, b = divmod(rank, high - low + 1)
+    return f"{low + a} × {low + b}", (low + a) * (low + b)
+
+
+def subtract_count(low, high):
+    # Only pairs with a >= b: "3 - 1" and "1 - 3" are the same question
+    n = high - low + 1
+    return n * (n + 1) // 2
+
+
+def subtract_unrank(rank, low, high):
+    # Triangular numbering: row i holds ranks i*(i+1)/2 .. i*(i+1)/2 + i
+    i = (math.isqrt(8 * rank + 1) - 1) // 2
+    j = rank - i * (i + 1) // 2
+    return f"{low + i} - {low + j}", i - j
+
+
+def divisor_range(low, high):
+    # A drawn 0 becomes divisor 1, so divisors run from max(low, 1)
+    first = max(low, 1)
+    return (first, high - first + 1) if high >= first else (1, 1)
+
+
+def divide_count(low, high):
+    return divisor_range(low, high)[1] * (high - low + 1)
+
+
+def divide_unrank(rank, low, high):
+    first, _ = divisor_range(low, high)
+    d, q = divmod(rank, high - low + 1)
+    divisor, quotient = first + d, low + q
+    return f"{divisor * quotient} ÷ {divisor}", quotient
+
+
+def power_count(low, high):
+    # Every base squared, plus cubes of bases up to 12
+    return (high - low + 1) + max(0, min(high, 12) - low + 1)
+
+
+def power_unrank(rank, low, high):
+    n = high - low + 1
+    base, exponent = (low + rank, 2) if rank < n else (low + rank - n, 3)
+    return f"{base}^{exponent}", base ** exponent
+
+
+def mixed_count(low, high):
+    return (high - low + 1) ** 3
+
+
+def mixed_unrank(rank, low, high):
+    # One question per (a, b, c); subtraction where it stays non-negative
+    # and a + b + c is odd, so both forms still appear
+    n = high - low + 1
+    a, b, c = low + rank // (n * n), low + rank // n % n, low + rank % n
+    if a >= b * c and (a + b + c) % 2:
+        return f"{a} - {b} × {c}", a - b * c
+    return f"{a} + {b} × {c}", a + b * c
+
+
+register_operator('+', "Addition", add_question, pair_count, add_unrank)
+register_operator('-', "Subtraction", subtract_question, subtract_count, subtract_unrank)
+register_operator('×', "Multiplication", multiply_question, pair_count, multiply_unrank)
+register_operator('÷', "Division", divide_question, divide_count, divide_unrank)
+register_operator('^', "Powers", power_question, power_count, power_unrank)
+register_operator('mix', "Mixed", mixed_question, mixed_count, mixed_unrank)
@@ -0,0 +1,224 @@
+"""
+No-Repeat Question Picker for the Maths Quiz
+Hands out questions so none repeats within a session, and optionally none
+repeats for a student across sessions until they have seen them all.
+
+Every (operator, low, high) combination has a finite question space that
+the operator numbers from 0 to count - 1 (see quiz_operators). Each space
+gets a QuestionDeck: a Fisher-Yates shuffle done one card at a time, with
+only the positions that have been swapped kept in dicts. Drawing is one
+randrange and two dict updates whatever the space size (advanced addition
+has 81 million questions) and however few questions are left, so there
+is no retry loop that slows down as the space fills. When a deck runs
+out it starts a new cycle.
+
+The difficulty tiers overlap ("+" over 0-5 is part of "+" over 0-9), so
+the texts of every question asked in a session are kept as well. A rank
+whose question was already asked from another deck is skipped; it stays
+drawn, so each rank is looked at at most once per cycle and the skips
+add up to no more than the deck size.
+
+With a history file the ranks issued to each student are saved per space
+(the latest MAX_HISTORY of them) and removed from the deck when that
+student plays again:
+
+    {"Ann": {"+:0:9": [17, 42, 3], "-:0:9": [12]}}
+
+Operators registered without count/unrank fall back to their generator
+with a bounded number of retries.
+"""
+
+import json
+import os
+import random
+from pathlib import Path
+
+from quiz_operators import OPERATORS
+
+MAX_HISTORY = 2000
+FALLBACK_TRIES = 20
+
+
+class QuestionDeck:
+    """
+    Random order over the ranks 0 .. size - 1 without repeats.
+
+    Positions below `remaining` hold the ranks not yet drawn. Positions
+    that were never swapped hold their own number, so only swapped ones
+    are stored.
+
+    Attributes:
+        size (int): Number of questions in the space
+        remaining (int): Questions left in this cycle
+        issued (list): Ranks drawn in this cycle, oldest first
+    """
+
+    def __init__(self, size, issued=()):
+        """
+        Args:
+            size (int): Number of questions in the space
+            issued (iterable): Ranks already seen, removed from the deck
+        """
+        self.size = size
+        self.remaining = size
+        self.values = {}        # position -> rank, where they differ
+        self.positions = {}     # rank -> position, where they differ
+        self.issued = []
+        for rank in issued:
+            self.remove(rank)
+
+    def place(self, position, rank):
+        if position == rank:
+            self.values.pop(position, None)
+            self.positions.pop(rank, None)
+        else:
+            self.values[position] = rank
+            self.positions[rank] = position
+
+    def take(self, position):
+        """Swap the rank at a position to the end of the live range and return it."""
+        last = self.remaining - 1
+        rank = self.values.get(position, position)
+        self.place(position, self.values.get(last, last))
+        self.place(last, rank)
+        self.remaining -= 1
+        self.issued.append(rank)
+        return rank
+
+    def draw(self):
+        """
+        A uniformly random rank not drawn yet in this cycle.
+
+        Returns:
+            int: The rank
+        """
+        if self.remaining == 0:
+            # Everything has been seen: start over
+            self.remaining = self.size
+            self.values.clear()
+            self.positions.clear()
+            self.issued = []
+        return self.take(random.randrange(self.remaining))
+
+    def remove(self, rank):
+        """Mark a rank as already seen (ignored if out of range or drawn)."""
+        if not 0 <= rank < self.size:
+            return
+        position = self.positions.get(rank, rank)
+        if position < self.remaining:
+            self.take(position)
+
+
+def space_key(symbol, low, high):
+    """History key of a question space, e.g. "+:0:9"."""
+    return f"{symbol}:{low}:{high}"
+
+
+def read_history(path):
+    """Saved ranks per student and space ({} if missing or unreadable)."""
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Could not read question history: {e}")
+        return {}
+
+
+def write_history(path, history):
+    """Write question history atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(history, file, separators=(',', ':'))
+    os.replace(temp_path, path)
+
+
+class QuestionPicker:
+    """
+    Question source for MathsQuiz that never repeats within a session
+    (until every question of a space has been asked).
+    """
+
+    def __init__(self, history_path=None):
+        """
+        Args:
+            history_path (Path, optional): File remembering each student's
+                questions across sessions (default: per session only)
+        """
+        self.history_path = history_path
+        self.history = read_history(history_path) if history_path else {}
+        self.student = None
+        self.decks = {}
+        self.seen_texts = set()
+
+    def select_student(self, name):
+        """
+        Start a session for a student.
+
+        Without a history file every session starts with full decks.
+        """
+        self.store_decks()
+        self.student = name
+        self.decks = {}
+        self.seen_texts = set()
+
+    def store_decks(self):
+        """Copy the current student's issued ranks into the history."""
+        if self.history_path is None or self.student is None:
+            return
+        saved = self.history.setdefault(self.student, {})
+        for key, deck in self.decks.items():
+            saved[key] = deck.issued[-MAX_HISTORY:]
+
+    def deck(self, symbol, low, high):
+        """The deck for a question space, created on first use."""
+        key = space_key(symbol, low, high)
+        deck = self.decks.get(key)
+        if deck is None:
+            issued = self.history.get(self.student, {}).get(key, ())
+            deck = self.decks[key] = QuestionDeck(OPERATORS[symbol].count(low, high), issued)
+        return deck
+
+    def next(self, symbol, low, high):
+        """
+        A question the student has not had yet.
+
+        Args:
+            symbol (str): Operator key in OPERATORS
+            low (int): Smallest operand
+            high (int): Largest operand
+
+        Returns:
+            tuple: (question_text, answer)
+        """
+        operator = OPERATORS[symbol]
+        if operator.count is None or operator.unrank is None:
+            draw = lambda: random.randint(low, high)
+            for _ in range(FALLBACK_TRIES):
+                question = operator.generate(draw)
+                if question[0] not in self.seen_texts:
+                    break
+        else:
+            deck = self.deck(symbol, low, high)
+            # Skip questions already asked from an overlapping deck; if the
+            # rest of this cycle was all asked, the last one is repeated
+            for _ in range(deck.remaining or deck.size):
+                question = operator.unrank(deck.draw(), low, high)
+                if question[0] not in self.seen_texts:
+                    break
+        self.seen_texts.add(question[0])
+        return question
+
+    def snapshot(self):
+        """History including the current session, as a plain dict copy."""
+        self.store_decks()
+        return {student: {key: list(ranks) for key, ranks in spaces.items()}
+                for student, spaces in self.history.items()}
+
+    def save(self):
+        """Write the history file (no-op without one)."""
+        if self.history_path is not None:
+            write_history(self.history_path, self.snapshot())
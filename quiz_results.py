@@ -0,0 +1,258 @@
+"""
+Persistent Results Store for the Maths Quiz
+Appends every finished quiz to a durable log and keeps leaderboard and
+per-student indexes so they never need a rescan of the log.
+
+Files (inside the store folder):
+    results.log       # one JSON object per line, append-only
+    results.idx.json  # snapshot of the indexes and the log offset it covers
+
+The log is the source of truth. Appends are flushed immediately and
+fsync'd in batches (every SYNC_EVERY results or SYNC_INTERVAL seconds,
+whichever comes first, and always on close). On open, the snapshot is
+loaded and only the part of the log written after it is replayed; a torn
+final line left by a crash is cut off before new results are appended.
+
+Several quiz windows on one machine may share a store. Each append takes
+an exclusive lock on "results.lock", first indexes any records other
+processes appended since it last looked, and then takes its offset from
+the end of the log, so the index snapshot always matches the log.
+
+Each difficulty keeps its best TOP_K results in an ascending list, so an
+insert shifts at most k entries and reading a leaderboard walks the end
+of the list in O(k) without sorting.
+"""
+
+import bisect
+import json
+import os
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+from marks_log import locked
+
+TOP_K = 10
+SYNC_EVERY = 8
+SYNC_INTERVAL = 2.0
+SNAPSHOT_EVERY = 256
+
+
+class ResultsStore:
+    """
+    Crash-safe append log of quiz results with in-memory indexes.
+
+    Attributes:
+        leaderboards (dict): difficulty -> ascending list of (score, -seq, student, finished)
+        students (dict): student -> {'sessions', 'total', 'best'}
+    """
+
+    def __init__(self, folder, top_k=TOP_K, sync_every=SYNC_EVERY, sync_interval=SYNC_INTERVAL):
+        """
+        Open (or create) a results store.
+
+        Args:
+            folder (Path): Directory holding the log and index files
+            top_k (int): Leaderboard size per difficulty
+            sync_every (int): Results written between forced fsyncs
+            sync_interval (float): Maximum seconds between fsyncs
+        """
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.folder / "results.log"
+        self.index_path = self.folder / "results.idx.json"
+        self.lock_path = self.folder / "results.lock"
+        self.top_k = top_k
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+
+        self.leaderboards = {}
+        self.students = {}
+        self.next_seq = 0
+        self.offset = 0
+
+        with locked(self.lock_path):
+            self.load_index()
+            self.replay_log()
+
+        self.log_file = open(self.log_path, 'ab')
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.since_snapshot = 0
+
+    def load_index(self):
+        """Load the index snapshot, falling back to an empty index."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('top_k') != self.top_k:
+                return  # leaderboard size changed, rebuild from the log
+            self.offset = data['offset']
+            self.next_seq = data['next_seq']
+            self.students = data['students']
+            self.leaderboards = {
+                level: sorted(tuple(entry) for entry in board)
+                for level, board in data['leaderboards'].items()
+            }
+        except (OSError, ValueError, KeyError):
+            self.leaderboards, self.students = {}, {}
+            self.next_seq = self.offset = 0
+
+    def replay_log(self):
+        """
+        Apply log records written after the snapshot to the indexes.
+
+        Also picks up records appended by other processes since the last
+        call, and truncates a partially written last line so the next
+        append starts on a clean record boundary. The caller holds the
+        store lock.
+        """
+        if not self.log_path.exists():
+            self.offset = 0
+            return
+
+        size = self.log_path.stat().st_size
+        if size == self.offset:
+            return
+        if self.offset > size:
+            # Snapshot is ahead of the log (log replaced), rebuild everything
+            self.leaderboards, self.students = {}, {}
+            self.next_seq = self.offset = 0
+
+        with open(self.log_path, 'rb+') as file:
+            file.seek(self.offset)
+            for line in file:
+                if not line.endswith(b'\n'):
+                    file.truncate(self.offset)
+                    print(f"Dropped incomplete result record at byte {self.offset}")
+                    break
+                try:
+                    self.index_record(json.loads(line))
+                except ValueError:
+                    print(f"Skipped unreadable result record at byte {self.offset}")
+                self.offset += len(line)
+
+    def index_record(self, record):
+        """
+        Add one result to the leaderboard heap and student aggregates.
+
+        Args:
+            record (dict): Result with 'student', 'difficulty', 'score', 'finished'
+        """
+        entry = (record['score'], -self.next_seq, record['student'], record['finished'])
+        self.next_seq += 1
+
+        board = self.leaderboards.setdefault(record['difficulty'], [])
+        if len(board) < self.top_k:
+            bisect.insort(board, entry)
+        elif entry > board[0]:
+            del board[0]
+            bisect.insort(board, entry)
+
+        stats = self.students.get(record['student'])
+        if stats is None:
+            stats = self.students[record['student']] = {'sessions': 0, 'total': 0, 'best': 0}
+        stats['sessions'] += 1
+        stats['total'] += record['score']
+        stats['best'] = max(stats['best'], record['score'])
+
+    def add_result(self, student, difficulty, score):
+        """
+        Append a finished quiz to the log and update the indexes.
+
+        Args:
+            student (str): Student name
+            difficulty (str): Difficulty level played
+            score (int): Final score out of 100
+        """
+        record = {
+            'student': student,
+            'difficulty': difficulty,
+            'score': score,
+            'finished': datetime.now().isoformat(timespec='seconds')
+        }
+        line = (json.dumps(record) + '\n').encode('utf-8')
+        with locked(self.lock_path):
+            # Index what other windows appended first, so the offset below
+            # covers exactly the records in the index
+            self.replay_log()
+            self.log_file.write(line)
+            self.log_file.flush()
+            self.offset = self.log_file.tell()
+            self.index_record(record)
+
+            self.unsynced += 1
+            if self.unsynced >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+                self.sync()
+
+            self.since_snapshot += 1
+            if self.since_snapshot >= SNAPSHOT_EVERY:
+                self.save_index()
+
+    def sync(self):
+        """Force buffered results onto disk."""
+        if self.unsynced:
+            os.fsync(self.log_file.fileno())
+            self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def save_index(self):
+        """Atomically write the index snapshot for the synced log prefix; the caller holds the store lock."""
+        self.sync()
+        data = {
+            'top_k': self.top_k,
+            'offset': self.offset,
+            'next_seq': self.next_seq,
+            'students': self.students,
+            'leaderboards': self.leaderboards
+        }
+        temp_path = self.index_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.index_path)
+        self.since_snapshot = 0
+
+    def leaderboard(self, difficulty, count=None):
+        """
+        Best results for a difficulty, highest score first.
+
+        Args:
+            difficulty (str): Difficulty level
+            count (int, optional): Number of entries (at most top_k)
+
+        Returns:
+            list: (student, score, finished) tuples
+        """
+        board = self.leaderboards.get(difficulty, [])
+        best = islice(reversed(board), count)
+        return [(student, score, finished) for score, _, student, finished in best]
+
+    def student_summary(self, student):
+        """
+        Aggregate results for one student.
+
+        Args:
+            student (str): Student name
+
+        Returns:
+            dict: sessions, average and best score (None if never played)
+        """
+        stats = self.students.get(student)
+        if stats is None:
+            return None
+        return {
+            'sessions': stats['sessions'],
+            'average': stats['total'] / stats['sessions'],
+            'best': stats['best']
+        }
+
+    def close(self):
+        """Sync the log, snapshot the indexes and close the file."""
+        if not self.log_file.closed:
+            with locked(self.lock_path):
+                self.replay_log()
+                self.save_index()
+            self.log_file.close()
@@ -0,0 +1,264 @@
+"""
+Response Time Statistics for the Maths Quiz
+Streaming, fixed-memory histograms of how long students take per question.
+
+Timestamps come from time.perf_counter_ns() and are bucketed HDR-style:
+values below 32 microseconds get a bucket each, and every power of two
+above that is split into 16 linear sub-buckets. That keeps the relative
+error of any percentile under ~6% while the histogram stays a flat array
+of 464 counters no matter how many answers are recorded.
+"""
+
+import json
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations with a fixed number of buckets.
+
+    Durations are recorded in nanoseconds and stored at microsecond
+    resolution. Anything longer than MAX_MICROS (about 71 minutes) is
+    clamped into the last bucket.
+    """
+
+    SUB_BITS = 5
+    SUB_COUNT = 1 << SUB_BITS          # linear buckets below 32us
+    HALF_COUNT = SUB_COUNT >> 1        # sub-buckets per power of two above
+    MAX_MICROS = (1 << 32) - 1
+    BUCKETS = SUB_COUNT + (32 - SUB_BITS) * HALF_COUNT
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * self.BUCKETS))
+        self.total = 0
+        self.sum_micros = 0
+        self.min_micros = None
+        self.max_micros = 0
+
+    @classmethod
+    def bucket_index(cls, micros):
+        """
+        Map a duration in microseconds to its bucket.
+
+        Args:
+            micros (int): Duration in microseconds
+
+        Returns:
+            int: Index into the counts array
+        """
+        if micros < cls.SUB_COUNT:
+            return micros
+        shift = micros.bit_length() - cls.SUB_BITS
+        return cls.SUB_COUNT + (shift - 1) * cls.HALF_COUNT + (micros >> shift) - cls.HALF_COUNT
+
+    @classmethod
+    def bucket_bounds(cls, index):
+        """
+        Return the inclusive microsecond range covered by a bucket.
+
+        Args:
+            index (int): Bucket index
+
+        Returns:
+            tuple: (lowest, highest) duration in microseconds
+        """
+        if index < cls.SUB_COUNT:
+            return index, index
+        shift, offset = divmod(index - cls.SUB_COUNT, cls.HALF_COUNT)
+        shift += 1
+        low = (offset + cls.HALF_COUNT) << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, nanos):
+        """
+        Add one duration to the histogram.
+
+        Args:
+            nanos (int): Duration in nanoseconds
+        """
+        micros = min(max(nanos, 0) // 1000, self.MAX_MICROS)
+        self.counts[self.bucket_index(micros)] += 1
+        self.total += 1
+        self.sum_micros += micros
+        if self.min_micros is None or micros < self.min_micros:
+            self.min_micros = micros
+        if micros > self.max_micros:
+            self.max_micros = micros
+
+    def mean(self):
+        """Return the mean duration in seconds (0.0 when empty)."""
+        if not self.total:
+            return 0.0
+        return self.sum_micros / self.total / 1e6
+
+    def percentile(self, pct):
+        """
+        Estimate a percentile from the bucket counts.
+
+        Args:
+            pct (float): Percentile between 0 and 100
+
+        Returns:
+            float: Duration in seconds (midpoint of the matching bucket)
+        """
+        if not self.total:
+            return 0.0
+        target = max(1, -(-self.total * pct // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                low, high = self.bucket_bounds(index)
+                # Never report outside the values actually observed
+                middle = min(max((low + high) / 2, self.min_micros), self.max_micros)
+                return middle / 1e6
+        return self.max_micros / 1e6
+
+    def merge(self, other):
+        """
+        Add the counts of another histogram into this one.
+
+        Args:
+            other (LatencyHistogram): Histogram to merge in
+        """
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+        self.sum_micros += other.sum_micros
+        if other.min_micros is not None:
+            if self.min_micros is None or other.min_micros < self.min_micros:
+                self.min_micros = other.min_micros
+        self.max_micros = max(self.max_micros, other.max_micros)
+
+    def summary(self):
+        """
+        Summarise the histogram for display or export.
+
+        Returns:
+            dict: count, mean, min, p50, p90, p99 and max in seconds
+        """
+        return {
+            'count': self.total,
+            'mean': round(self.mean(), 3),
+            'min': round((self.min_micros or 0) / 1e6, 3),
+            'p50': round(self.percentile(50), 3),
+            'p90': round(self.percentile(90), 3),
+            'p99': round(self.percentile(99), 3),
+            'max': round(self.max_micros / 1e6, 3)
+        }
+
+    def to_dict(self):
+        """Return the non-empty buckets plus summary, suitable for JSON."""
+        data = self.summary()
+        data['buckets'] = {
+            str(index): count for index, count in enumerate(self.counts) if count
+        }
+        return data
+
+
+class ResponseTimeTracker:
+    """
+    Times each quiz question and aggregates the results per difficulty.
+
+    A question is started when it is shown and finished when it is
+    resolved (answered correctly, or wrong on the last attempt), so the
+    recorded time includes any retry.
+    """
+
+    def __init__(self):
+        self.by_difficulty = {}     # difficulty -> LatencyHistogram (whole run)
+        self.shown_at = None        # perf_counter_ns of the current question
+        self.new_session(None)
+
+    def new_session(self, difficulty):
+        """
+        Start timing a new quiz session.
+
+        Args:
+            difficulty (str): Difficulty level chosen for the session
+        """
+        self.session_difficulty = difficulty
+        self.session_started = datetime.now()
+        self.session_histogram = LatencyHistogram()
+        self.session_times = []     # (duration_ns, correct) per question
+        self.shown_at = None
+
+    def question_shown(self):
+        """Mark the moment the current question appeared on screen."""
+        self.shown_at = time.perf_counter_ns()
+
+    def question_answered(self, correct):
+        """
+        Stop the timer for the current question and record the result.
+
+        Args:
+            correct (bool): Whether the question was eventually answered correctly
+
+        Returns:
+            int: Time taken in nanoseconds, or None if no question was shown
+        """
+        if self.shown_at is None:
+            return None
+        elapsed = time.perf_counter_ns() - self.shown_at
+        self.shown_at = None
+
+        self.session_times.append((elapsed, correct))
+        self.session_histogram.record(elapsed)
+        histogram = self.by_difficulty.get(self.session_difficulty)
+        if histogram is None:
+            histogram = self.by_difficulty[self.session_difficulty] = LatencyHistogram()
+        histogram.record(elapsed)
+        return elapsed
+
+    def describe_session(self):
+        """
+        Build a short human readable summary of this session's timings.
+
+        Returns:
+            str: Multi-line text for the results screen
+        """
+        stats = self.session_histogram.summary()
+        if not stats['count']:
+            return "No answers timed"
+        return (
+            f"Average time: {stats['mean']:.1f}s\n"
+            f"Median: {stats['p50']:.1f}s  Slowest: {stats['max']:.1f}s"
+        )
+
+    def export_session(self, folder, score):
+        """
+        Write this session's timings to a timestamped JSON file.
+
+        Args:
+            folder (Path): Directory for session files (created if missing)
+            score (int): Final score of the session
+
+        Returns:
+            Path: The file that was written
+        """
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        stamp = self.session_started.strftime("%Y%m%d-%H%M%S-%f")
+        file_path = folder / f"session-{stamp}.json"
+
+        data = {
+            'started': self.session_started.isoformat(timespec='seconds'),
+            'difficulty': self.session_difficulty,
+            'score': score,
+            'questions': [
+                {'seconds': round(elapsed / 1e9, 3), 'correct': correct}
+                for elapsed, correct in self.session_times
+            ],
+            'session': self.session_histogram.to_dict(),
+            'by_difficulty': {
+                str(level): histogram.to_dict()
+                for level, histogram in self.by_difficulty.items()
+            }
+        }
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2)
+        return file_path
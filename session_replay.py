@@ -0,0 +1,335 @@
+"""
+Session Record and Replay
+Records what a user did in the Maths Quiz or the Joke Teller and replays
+it headlessly at full speed, comparing per-step timings with a baseline.
+
+Both apps take all their randomness from the global random module, so a
+session is reproducible from a seed plus the sequence of user actions:
+
+    {"app": "quiz", "seed": 1234567, "actions": [
+        {"action": "set_difficulty", "args": ["easy"],
+         "inputs": {"name_entry": "Ann", "number_entry": "8439", "answer_entry": ""},
+         "state": {"question": "3 + 4", "score": 0, "current_question": 1}, "ms": 2.1},
+        ...]}
+
+Recording wraps the action methods on the app class (buttons, star
+clicks and <Return> are bound to them when the widgets are built, so
+the class must be patched before the app is created). Only top-level
+calls are recorded; show_new_joke calling activate_surprise_mode is one
+step. Entry text is captured before each action and a few attributes
+after it, so a replay that drifts from the recording is detected.
+
+Replay loads the app in this process with a withdrawn window, the dummy
+SDL audio driver, message boxes that answer at once (always "play
+again") and results, timings and marks written to a scratch folder.
+Exam-server sessions and quizzes run with --remember-questions cannot be
+replayed.
+
+Usage:
+    A1_RECORD_SESSION=session.json python 01-MathsQuiz.py
+    python session_replay.py session.json [--repeat 5] [--save-baseline]
+                                          [--baseline FILE] [--tolerance 0.25]
+
+Replaying needs a display (or Xvfb).
+"""
+
+import argparse
+import functools
+import importlib.util
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# Per app: script, class, recorded actions, entry widgets, state attributes
+APPS = {
+    'quiz': {
+        'script': "01-MathsQuiz.py",
+        'class': "MathsQuiz",
+        'actions': ('set_difficulty', 'check_answer'),
+        'inputs': ('name_entry', 'number_entry', 'answer_entry'),
+        'state': ('question', 'score', 'current_question')
+    },
+    'jokes': {
+        'script': "02-AlexaJokes.py",
+        'class': "AlexaJokeApp",
+        'actions': ('setup_gui', 'show_new_joke', 'show_punchline', 'show_rating',
+                    'rate_joke', 'activate_surprise_mode', 'select_category'),
+        'inputs': ('category_box',),
+        'state': ('current_joke', 'joke_count', 'punchline_shown', 'rating_given', 'category')
+    }
+}
+
+TOLERANCE = 0.25        # allowed slowdown before a step counts as regressed
+MIN_DELTA_MS = 0.5      # ignore differences smaller than this
+
+
+def read_inputs(app, kind):
+    """Text of the app's entry widgets (those that exist yet)."""
+    inputs = {}
+    for name in APPS[kind]['inputs']:
+        widget = getattr(app, name, None)
+        if widget is not None:
+            inputs[name] = widget.get()
+    return inputs
+
+
+def write_inputs(app, inputs):
+    """Put recorded text back into the app's entry widgets."""
+    for name, text in inputs.items():
+        widget = getattr(app, name)
+        if hasattr(widget, 'current'):
+            widget.set(text)            # read-only ttk.Combobox
+        else:
+            widget.delete(0, 'end')
+            widget.insert(0, text)
+
+
+def read_state(app, kind):
+    """Attributes used to check that a replay follows the recording."""
+    return {name: getattr(app, name, None) for name in APPS[kind]['state']}
+
+
+class SessionRecorder:
+    """
+    Seeds the global RNG and records the user actions of one app.
+
+    Attributes:
+        seed (int): Seed given to random before the app is created
+        actions (list): Recorded steps, oldest first
+    """
+
+    def __init__(self, app_class, kind, seed=None):
+        """
+        Args:
+            app_class (type): MathsQuiz or AlexaJokeApp (not yet instantiated)
+            kind (str): 'quiz' or 'jokes'
+            seed (int, optional): RNG seed (default: random)
+        """
+        self.app_class = app_class
+        self.kind = kind
+        self.seed = seed if seed is not None else int.from_bytes(os.urandom(4), 'little')
+        self.actions = []
+        self.depth = 0
+        self.originals = {}
+
+    def install(self):
+        """Seed random and wrap the action methods on the app class."""
+        random.seed(self.seed)
+        for name in APPS[self.kind]['actions']:
+            original = getattr(self.app_class, name)
+            self.originals[name] = original
+            setattr(self.app_class, name, self.wrap(name, original))
+
+    def wrap(self, name, method):
+        @functools.wraps(method)
+        def recorded(app, *args):
+            if self.depth:
+                return method(app, *args)
+            inputs = read_inputs(app, self.kind)
+            self.depth += 1
+            started = time.perf_counter()
+            try:
+                return method(app, *args)
+            finally:
+                elapsed = (time.perf_counter() - started) * 1000
+                self.depth -= 1
+                self.actions.append({
+                    'action': name, 'args': list(args), 'inputs': inputs,
+                    'state': read_state(app, self.kind), 'ms': round(elapsed, 3)
+                })
+        return recorded
+
+    def uninstall(self):
+        """Restore the original methods."""
+        for name, original in self.originals.items():
+            setattr(self.app_class, name, original)
+        self.originals = {}
+
+    def save(self, path):
+        """Write the session as JSON."""
+        session = {'app': self.kind, 'seed': self.seed, 'actions': self.actions}
+        Path(path).write_text(json.dumps(session, indent=1), encoding='utf-8')
+        print(f"Recorded {len(self.actions)} actions to {path}")
+
+
+def record_from_env(app_class, kind):
+    """
+    Start recording if $A1_RECORD_SESSION names an output file.
+
+    Returns:
+        SessionRecorder: The installed recorder, or None
+    """
+    if not os.environ.get("A1_RECORD_SESSION"):
+        return None
+    recorder = SessionRecorder(app_class, kind)
+    recorder.install()
+    return recorder
+
+
+def save_from_env(recorder):
+    """Save a recorder started by record_from_env (if any)."""
+    if recorder is not None:
+        try:
+            recorder.save(os.environ["A1_RECORD_SESSION"])
+        except (OSError, TypeError) as e:
+            # TypeError: an action was called with arguments JSON cannot hold
+            print(f"Could not save recorded session: {e}")
+
+
+class HeadlessMessages:
+    """Stand-in for tkinter.messagebox that never blocks and always replays."""
+
+    def showinfo(self, title, message):
+        return "ok"
+
+    def showerror(self, title, message):
+        return "ok"
+
+    def askyesno(self, title, message):
+        return True
+
+
+def load_app_module(kind):
+    """Import an app script (their file names are not valid module names)."""
+    spec = importlib.util.spec_from_file_location(f"replay_{kind}", ROOT / APPS[kind]['script'])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def create_app(kind, module, scratch):
+    """Build a withdrawn app that writes only into a scratch folder."""
+    if kind == 'quiz':
+        from quiz_export import MarksExporter, QUIZ_MARKS_FILE
+
+        marks_path = scratch / QUIZ_MARKS_FILE.name
+        if QUIZ_MARKS_FILE.exists():
+            shutil.copy(QUIZ_MARKS_FILE, marks_path)
+        module.RESULTS_DIR = scratch / "results"
+        module.SESSIONS_DIR = scratch / "sessions"
+        module.messagebox = HeadlessMessages()
+        module.MarksExporter = lambda: MarksExporter(marks_path)
+        app = module.MathsQuiz()
+        return app, app.window
+
+    import tkinter as tk
+    root = tk.Tk()
+    app = module.AlexaJokeApp(root)
+    return app, root
+
+
+def close_app(kind, app, root):
+    app.tasks.close()
+    if kind == 'quiz':
+        app.results.close()
+        app.exporter.close()
+    root.destroy()
+
+
+def replay_once(session):
+    """
+    Replay a session once.
+
+    Returns:
+        list: Milliseconds per step
+
+    Raises:
+        RuntimeError: If the app's state drifts from the recording
+    """
+    kind = session['app']
+    module = load_app_module(kind)
+    scratch = Path(tempfile.mkdtemp(prefix="replay-"))
+    random.seed(session['seed'])
+    app, root = create_app(kind, module, scratch)
+    root.withdraw()
+
+    timings = []
+    try:
+        for number, step in enumerate(session['actions'], 1):
+            write_inputs(app, step['inputs'])
+            method = getattr(app, step['action'])
+            started = time.perf_counter()
+            method(*step['args'])
+            root.update_idletasks()
+            timings.append((time.perf_counter() - started) * 1000)
+
+            # Read state as the recorder did, before background work
+            # submitted by the step (saving results, the results dialog)
+            # has been delivered; then let it finish before the next step
+            state = read_state(app, kind)
+            app.tasks.drain()
+            root.update()
+            if state != step['state']:
+                raise RuntimeError(f"step {number} ({step['action']}) diverged: "
+                                   f"expected {step['state']}, got {state}")
+    finally:
+        close_app(kind, app, root)
+        shutil.rmtree(scratch, ignore_errors=True)
+    return timings
+
+
+def compare(timings, baseline, tolerance=TOLERANCE):
+    """
+    Steps that got slower than the baseline.
+
+    Returns:
+        list: (step number, baseline ms, replay ms) for each regressed step
+    """
+    regressed = []
+    for number, (now, before) in enumerate(zip(timings, baseline), 1):
+        if now > before * (1 + tolerance) and now - before > MIN_DELTA_MS:
+            regressed.append((number, before, now))
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session and compare timings")
+    parser.add_argument("session", type=Path)
+    parser.add_argument("--repeat", type=int, default=5, help="replays; the median per step is used")
+    parser.add_argument("--baseline", type=Path, help="baseline file (default: <session>.baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    session = json.loads(args.session.read_text(encoding='utf-8'))
+    baseline_path = args.baseline or args.session.with_suffix(".baseline.json")
+
+    try:
+        runs = [replay_once(session) for _ in range(args.repeat)]
+    except RuntimeError as e:
+        print(f"Replay failed: {e}")
+        sys.exit(2)
+    timings = [statistics.median(step) for step in zip(*runs)]
+
+    baseline = None
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8'))['ms']
+
+    print(f"{'step':>4}  {'action':<24} {'ms':>8} {'baseline':>9}")
+    for number, (step, ms) in enumerate(zip(session['actions'], timings), 1):
+        before = f"{baseline[number - 1]:9.3f}" if baseline and number <= len(baseline) else f"{'-':>9}"
+        print(f"{number:>4}  {step['action']:<24} {ms:8.3f} {before}")
+    print(f"Total: {sum(timings):.1f} ms over {len(timings)} steps")
+
+    if args.save_baseline or baseline is None:
+        baseline_path.write_text(json.dumps({'ms': [round(ms, 3) for ms in timings]}), encoding='utf-8')
+        print(f"Saved baseline to {baseline_path}")
+        return
+
+    regressed = compare(timings, baseline, args.tolerance)
+    for number, before, now in regressed:
+        print(f"Regression at step {number}: {before:.3f} ms -> {now:.3f} ms")
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Sound Bank
+Sound effects registered by name and decoded only when they are needed.
+
+register() records an asset name and its encoded size; nothing is read
+or decoded. get() decodes a sound the first time it is played (a miss)
+and reuses it afterwards (a hit). prefetch() does the same decode ahead
+of time, e.g. on a worker thread while a punchline is pending, so that
+play is a hit. Decoding happens outside the bank's lock, so a prefetch
+on a worker thread never holds up get() on the UI thread.
+
+Decoded sounds are kept in least-recently-used order. Once their
+decoded size passes the byte budget the coldest are unloaded, except
+sounds that are still playing and sounds added already decoded with
+add() (the generated fallback tones).
+
+Usage:
+    bank = SoundBank(assets, budget=16 * 1024 * 1024)
+    bank.register('laughter', "Sounds/57814__timtube__laughing-9.wav")
+    bank.get('laughter').play()
+    print(bank.stats())
+"""
+
+import threading
+from collections import OrderedDict
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+MEMORY_BUDGET = 32 * 1024 * 1024
+
+
+def decode_with_pygame(file):
+    """Decode an open sound file with the pygame mixer."""
+    return pygame.mixer.Sound(file=file)
+
+
+def pygame_size(sound):
+    """
+    Bytes held by a decoded pygame Sound.
+
+    Computed from its length and the mixer format rather than get_raw(),
+    which would copy the whole buffer.
+    """
+    frequency, size, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * frequency) * channels * abs(size) // 8
+
+
+def is_playing(sound):
+    """Whether a sound is playing on any channel (unloading it would cut it off)."""
+    channels = getattr(sound, 'get_num_channels', None)
+    return bool(channels and channels())
+
+
+class SoundEntry:
+    """
+    A registered sound.
+
+    Attributes:
+        key (str): Name the app plays it by
+        asset (str): Asset name, or None for sounds added already decoded
+        encoded_size (int): Size of the file in bytes (0 for decoded sounds)
+        pinned (bool): Never unloaded
+    """
+
+    __slots__ = ('key', 'asset', 'encoded_size', 'pinned')
+
+    def __init__(self, key, asset, encoded_size=0, pinned=False):
+        self.key = key
+        self.asset = asset
+        self.encoded_size = encoded_size
+        self.pinned = pinned
+
+
+class SoundBank:
+    """
+    Lazily decoded sounds with an LRU byte budget.
+
+    Safe to prefetch from a worker thread while the UI thread plays.
+
+    Attributes:
+        hits (int): get() calls served by an already decoded sound
+        misses (int): get() calls that had to decode
+        evictions (int): Sounds unloaded to stay within the budget
+        prefetches (int): Sounds decoded by prefetch()
+    """
+
+    def __init__(self, assets, budget=MEMORY_BUDGET, decode=None, measure=None):
+        """
+        Args:
+            assets (AssetResolver): Where sound files are read from
+            budget (int): Bytes of decoded audio to keep resident
+            decode (callable, optional): file object -> sound (default: pygame)
+            measure (callable, optional): sound -> decoded bytes (default: pygame)
+        """
+        self.assets = assets
+        self.budget = budget
+        self.decode = decode or decode_with_pygame
+        self.measure = measure or pygame_size
+        self.entries = {}
+        self.loaded = OrderedDict()     # key -> sound, coldest first
+        self.loading = {}               # key -> Event set when its decode ends
+        self.sizes = {}
+        self.resident = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prefetches = 0
+        self.lock = threading.RLock()
+
+    def register(self, key, asset):
+        """
+        Make a sound file available without reading it.
+
+        Returns:
+            bool: False if the asset does not exist
+        """
+        if not self.assets.exists(asset):
+            return False
+        if self.assets.bundle is not None:
+            size = self.assets.bundle.manifest[asset]['length']
+        else:
+            size = (self.assets.resources_dir / asset).stat().st_size
+        with self.lock:
+            self.entries[key] = SoundEntry(key, asset, size)
+        return True
+
+    def add(self, key, sound):
+        """Add a sound that is already decoded; it is never unloaded."""
+        with self.lock:
+            self.unload(key)
+            self.entries[key] = SoundEntry(key, None, pinned=True)
+            self.store(key, sound)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def keys(self):
+        """Registered sound names."""
+        return list(self.entries)
+
+    def get(self, key):
+        """
+        A decoded sound, decoding it on first use.
+
+        A hit only takes the lock long enough to look the sound up. If
+        another thread is already decoding it, this waits for that decode
+        instead of starting a second one.
+
+        Returns:
+            The sound, or None if it is unknown or cannot be decoded
+        """
+        with self.lock:
+            if key in self.loaded:
+                self.hits += 1
+                self.loaded.move_to_end(key)
+                return self.loaded[key]
+            if key not in self.entries:
+                return None
+            self.misses += 1
+            decoding = self.loading.get(key)
+            if decoding is None:
+                entry = self.claim(key)
+        if decoding is not None:
+            decoding.wait()
+            with self.lock:
+                return self.loaded.get(key)
+        return self.load(entry)
+
+    def prefetch(self, key):
+        """Decode a sound ahead of use (no-op if it is resident or being decoded)."""
+        with self.lock:
+            if key in self.loaded or key in self.loading or key not in self.entries:
+                return
+            self.prefetches += 1
+            entry = self.claim(key)
+        self.load(entry)
+
+    def claim(self, key):
+        """Mark a sound as being decoded; the caller holds the lock."""
+        self.loading[key] = threading.Event()
+        return self.entries[key]
+
+    def load(self, entry):
+        """Decode a claimed sound without holding the lock, then store it."""
+        try:
+            with self.assets.open(entry.asset) as file:
+                sound = self.decode(file)
+        except Exception as e:
+            # Unplayable file: forget it so it is not retried on every joke
+            print(f"✗ Failed to load {entry.asset}: {e}")
+            sound = None
+        with self.lock:
+            if sound is None:
+                if self.entries.get(entry.key) is entry:
+                    del self.entries[entry.key]
+            elif self.entries.get(entry.key) is entry:
+                self.store(entry.key, sound)
+            self.loading.pop(entry.key).set()
+        return sound
+
+    def store(self, key, sound):
+        """Make a decoded sound resident and enforce the budget."""
+        try:
+            size = self.measure(sound)
+        except Exception:
+            size = 0
+        self.unload(key)
+        self.loaded[key] = sound
+        self.sizes[key] = size
+        self.resident += size
+        self.evict(keep=key)
+
+    def evict(self, keep):
+        """Unload the coldest sounds until within budget."""
+        for key in list(self.loaded):
+            if self.resident <= self.budget:
+                break
+            if key == keep or self.entries[key].pinned or is_playing(self.loaded[key]):
+                continue
+            self.unload(key)
+            self.evictions += 1
+
+    def unload(self, key):
+        """Drop a decoded sound (it stays registered)."""
+        with self.lock:
+            if key in self.loaded:
+                del self.loaded[key]
+                self.resident -= self.sizes.pop(key)
+
+    def stats(self):
+        """Counters and resident size."""
+        with self.lock:
+            return {'registered': len(self.entries), 'resident': len(self.loaded),
+                    'resident_bytes': self.resident, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions,
+                    'prefetches': self.prefetches}
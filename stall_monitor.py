@@ -0,0 +1,158 @@
+"""
+Tk Event Loop Stall Monitor
+Finds out what the GUI was doing when it froze.
+
+A heartbeat scheduled with root.after() runs every `interval` ms on the Tk
+thread and records how late it fired (mainloop lag). A watchdog thread
+checks the last heartbeat; if none has arrived for `threshold` seconds
+the Tk thread is blocked, so the watchdog samples its Python stack (up to
+MAX_SAMPLES times per stall). When the heartbeat resumes, the stall
+with its duration and stack samples is added to a ring buffer of the
+last `capacity` stalls. That buffer and a lag histogram are then written
+to a JSON report.
+
+The heartbeat does no I/O and the report is written from the watchdog
+thread, so the monitor itself never adds to the lag it measures.
+
+Usage:
+    monitor = StallMonitor(root, "alexa_jokes")
+    monitor.start()
+    root.mainloop()
+    monitor.stop()
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+from quiz_stats import LatencyHistogram
+
+REPORTS_DIR = Path(__file__).resolve().parent / "stall_reports"
+MAX_SAMPLES = 5
+
+
+class StallMonitor:
+    """
+    Heartbeat-based lag monitor for a Tk root window.
+
+    Attributes:
+        lag (LatencyHistogram): How late each heartbeat fired
+        stalls (deque): The most recent stall records
+    """
+
+    def __init__(self, root, app_name, interval=100, threshold=0.25, capacity=50, report_dir=REPORTS_DIR):
+        """
+        Args:
+            root (tk.Tk): Window whose mainloop is monitored
+            app_name (str): Used to name the report file
+            interval (int): Heartbeat period in milliseconds
+            threshold (float): Seconds without a heartbeat that count as a stall
+            capacity (int): Number of stalls kept in the report
+            report_dir (Path): Folder for the report
+        """
+        self.root = root
+        self.interval = interval
+        self.threshold = threshold
+        self.report_path = Path(report_dir) / f"{app_name}-stalls.json"
+        self.lag = LatencyHistogram()
+        self.stalls = deque(maxlen=capacity)
+
+        self.main_thread_id = threading.main_thread().ident
+        self.last_beat = time.perf_counter()
+        self.expected_beat = None
+        self.after_id = None
+        self.stopped = threading.Event()
+        self.watchdog = None
+
+    def start(self):
+        """Begin heartbeats and start the watchdog thread."""
+        self.main_thread_id = threading.get_ident()
+        self.stopped.clear()
+        self.last_beat = time.perf_counter()
+        self.expected_beat = self.last_beat + self.interval / 1000
+        self.after_id = self.root.after(self.interval, self.heartbeat)
+        self.watchdog = threading.Thread(target=self.watch, name="stall-watchdog", daemon=True)
+        self.watchdog.start()
+
+    def heartbeat(self):
+        """Runs on the Tk thread: note the time and how late we are."""
+        now = time.perf_counter()
+        self.lag.record(int(max(0.0, now - self.expected_beat) * 1e9))
+        self.last_beat = now
+        self.expected_beat = now + self.interval / 1000
+        if not self.stopped.is_set():
+            self.after_id = self.root.after(self.interval, self.heartbeat)
+
+    def sample_stack(self):
+        """Formatted stack of the Tk thread, or an empty list if unavailable."""
+        frame = sys._current_frames().get(self.main_thread_id)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame)
+
+    def watch(self):
+        """Watchdog loop: detect stalls, sample stacks and record them."""
+        poll = self.threshold / 2
+        while not self.stopped.wait(poll):
+            beat = self.last_beat
+            if time.perf_counter() - beat < self.threshold:
+                continue
+
+            # The Tk thread is stuck; sample until the heartbeat comes back
+            started = datetime.now()
+            samples = []
+            while self.last_beat == beat and not self.stopped.is_set():
+                if len(samples) < MAX_SAMPLES:
+                    samples.append({
+                        'after': round(time.perf_counter() - beat, 3),
+                        'stack': self.sample_stack()
+                    })
+                self.stopped.wait(self.threshold)
+            if self.stopped.is_set():
+                break
+
+            self.stalls.append({
+                'started': started.isoformat(timespec='milliseconds'),
+                'duration': round(self.last_beat - beat, 3),
+                'samples': samples
+            })
+            self.write_report()
+
+    def write_report(self):
+        """Write the stall ring buffer and lag summary (atomically)."""
+        report = {
+            'written': datetime.now().isoformat(timespec='seconds'),
+            'interval_ms': self.interval,
+            'threshold': self.threshold,
+            'lag': self.lag.summary(),
+            'stalls': list(self.stalls)
+        }
+        try:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.report_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=2)
+            os.replace(temp_path, self.report_path)
+        except OSError as e:
+            print(f"Could not write stall report: {e}")
+
+    def stop(self):
+        """Stop heartbeats and the watchdog, writing a final report if anything stalled."""
+        self.stopped.set()
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except Exception:
+                pass  # window already destroyed
+            self.after_id = None
+        if self.watchdog is not None:
+            self.watchdog.join(timeout=1)
+            self.watchdog = None
+        if self.stalls:
+            self.write_report()
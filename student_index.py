@@ -0,0 +1,189 @@
+"""
+Student Marks Index
+Fast lookups over a StudentMarks column store.
+
+- Student code -> row: a dict built from the code column.
+- Name prefix search: row numbers sorted by case-folded name, searched
+  with bisect, so a prefix query costs O(log n + matches).
+- Best / worst N by total: a partial selection over the totals column
+  (NumPy argpartition, or heapq without NumPy).
+- Grade histogram: counted straight from the grade column.
+
+The name order is the expensive part to build (every name is decoded and
+sorted), so it is saved next to the marks file as "<file>.idx" together
+with the file's size and modification time. A warm start loads it
+directly, and a changed marks file is detected and the index rebuilt.
+"""
+
+import heapq
+import json
+import os
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from student_marks import GRADE_BOUNDS, np
+
+INDEX_VERSION = 1
+
+
+class MarksIndex:
+    """
+    Indexes over one StudentMarks instance.
+
+    Attributes:
+        marks (StudentMarks): The indexed columns
+        by_number (dict): student code -> row index
+        name_order (array): Row indices sorted by case-folded name
+    """
+
+    def __init__(self, marks, name_order=None):
+        """
+        Args:
+            marks (StudentMarks): Loaded marks
+            name_order (array, optional): Previously saved name order to reuse
+        """
+        self.marks = marks
+        # Reversed so the first row wins if a code appears twice
+        self.by_number = dict(zip(reversed(marks.numbers), range(len(marks) - 1, -1, -1)))
+        if name_order is None:
+            name_order = array('I', sorted(range(len(marks)), key=self.name_key))
+        self.name_order = name_order
+        self._totals = None
+
+    def name_key(self, index):
+        """Sort key for a row: its case-folded name."""
+        return self.marks.name(index).casefold()
+
+    @property
+    def totals(self):
+        """Overall totals column, computed on first use."""
+        if self._totals is None:
+            self._totals = self.marks.totals()
+        return self._totals
+
+    def find_number(self, number):
+        """
+        Look up a student by code.
+
+        Args:
+            number (int): Student code
+
+        Returns:
+            int: Row index, or None if not present
+        """
+        return self.by_number.get(number)
+
+    def find_name_prefix(self, prefix, limit=50):
+        """
+        Rows whose name starts with a prefix (case-insensitive), in name order.
+
+        Args:
+            prefix (str): Start of the name
+            limit (int): Maximum number of rows returned
+
+        Returns:
+            list: Row indices
+        """
+        prefix = prefix.casefold()
+        start = bisect_left(self.name_order, prefix, key=self.name_key)
+        rows = []
+        for position in range(start, len(self.name_order)):
+            row = self.name_order[position]
+            if len(rows) >= limit or not self.name_key(row).startswith(prefix):
+                break
+            rows.append(row)
+        return rows
+
+    def top(self, count, lowest=False):
+        """
+        Students with the highest (or lowest) overall total.
+
+        Args:
+            count (int): Number of students
+            lowest (bool): Return the bottom students instead
+
+        Returns:
+            list: Row indices, best first (or worst first when lowest=True)
+        """
+        totals = self.totals
+        count = min(count, len(self.marks))
+        if np is not None and count:
+            # Partial selection in C, then sort just the chosen few
+            keys = totals if lowest else -totals
+            chosen = np.argpartition(keys, count - 1)[:count]
+            return [int(row) for row in chosen[np.argsort(keys[chosen], kind='stable')]]
+        choose = heapq.nsmallest if lowest else heapq.nlargest
+        return choose(count, range(len(self.marks)), key=totals.__getitem__)
+
+    def grade_histogram(self):
+        """
+        Number of students per grade.
+
+        Returns:
+            dict: letter -> count, in grade order
+        """
+        grades = self.marks.grades()
+        return {letter: grades.count(letter.encode()) for _, letter in GRADE_BOUNDS}
+
+
+def index_path_for(marks_path):
+    """Sidecar index file for a marks file."""
+    marks_path = Path(marks_path)
+    return marks_path.with_name(marks_path.name + ".idx")
+
+
+def source_stamp(marks_path):
+    """Size and modification time that identify a version of the marks file."""
+    stat = os.stat(marks_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def save_index(index, marks_path):
+    """
+    Write the name order to the sidecar file atomically.
+
+    Args:
+        index (MarksIndex): Index to save
+        marks_path (Path): The marks file the index was built from
+    """
+    path = index_path_for(marks_path)
+    header = dict(source_stamp(marks_path), version=INDEX_VERSION, rows=len(index.marks))
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, 'wb') as file:
+        file.write(json.dumps(header).encode('utf-8') + b'\n')
+        index.name_order.tofile(file)
+    os.replace(temp_path, path)
+
+
+def load_index(marks, marks_path, save=True):
+    """
+    Build a MarksIndex, reusing the saved name order when it is still valid.
+
+    Args:
+        marks (StudentMarks): Marks loaded from marks_path
+        marks_path (Path): The marks file
+        save (bool): Save a freshly built index for the next start
+
+    Returns:
+        MarksIndex: Ready-to-query index
+    """
+    path = index_path_for(marks_path)
+    try:
+        with open(path, 'rb') as file:
+            header = json.loads(file.readline())
+            expected = dict(source_stamp(marks_path), version=INDEX_VERSION, rows=len(marks))
+            if header == expected:
+                order = array('I')
+                order.fromfile(file, len(marks))
+                return MarksIndex(marks, order)
+    except (OSError, ValueError, EOFError):
+        pass  # missing, stale or damaged index, rebuild below
+
+    index = MarksIndex(marks)
+    if save:
+        try:
+            save_index(index, marks_path)
+        except OSError as e:
+            print(f"Could not save marks index: {e}")
+    return index
@@ -0,0 +1,282 @@
+"""
+Student Marks Loader
+Streams studentMarks.txt into typed columns for reporting.
+
+File format (see A1 - Resources/studentMarks.txt):
+    10                              # number of students
+    1345,John Curry,8,15,7,45       # code,name,cw1,cw2,cw3,exam
+
+The file is read in binary chunks and each row is appended straight into
+array columns (student codes, the three coursework marks and the exam
+mark). Names go into one bytes buffer with an offsets array, so no
+per-student dict or object is kept. Totals, percentages and grades are
+computed over whole columns, using NumPy when it is installed and plain
+arrays otherwise.
+
+Usage:
+    python student_marks.py [path/to/studentMarks.txt]
+"""
+
+import os
+import sys
+from array import array
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, columns work without it
+    np = None
+
+from asset_bundle import RESOURCES_DIR
+
+# The marks file is edited in place, so it is always read from the folder
+MARKS_FILE = RESOURCES_DIR / "studentMarks.txt"
+CHUNK_SIZE = 1 << 20
+MAX_COURSEWORK = 20
+MAX_EXAM = 100
+MAX_TOTAL = 3 * MAX_COURSEWORK + MAX_EXAM
+# Student codes are stored in an array('i') column
+MIN_CODE, MAX_CODE = -2 ** 31, 2 ** 31 - 1
+
+# Lower percentage bound of each grade, best first
+GRADE_BOUNDS = ((70, 'A'), (60, 'B'), (50, 'C'), (40, 'D'), (0, 'F'))
+
+
+class MarksFileError(ValueError):
+    """Raised when a marks file is malformed."""
+
+
+def grade_for(percentage):
+    """
+    Letter grade for a single percentage.
+
+    Args:
+        percentage (float): Overall percentage (0-100)
+
+    Returns:
+        str: 'A', 'B', 'C', 'D' or 'F'
+    """
+    for bound, letter in GRADE_BOUNDS:
+        if percentage >= bound:
+            return letter
+    return 'F'
+
+
+class StudentMarks:
+    """
+    Column store of student marks.
+
+    Attributes:
+        numbers (array): Student codes
+        coursework1, coursework2, coursework3 (array): Coursework marks out of 20
+        exam (array): Exam marks out of 100
+        names (bytes): UTF-8 names, concatenated
+        name_offsets (array): Start of each name in `names`, plus a final end offset
+        declared_count (int): Student count from the header line
+    """
+
+    def __init__(self):
+        self.numbers = array('i')
+        self.coursework1 = array('B')
+        self.coursework2 = array('B')
+        self.coursework3 = array('B')
+        self.exam = array('B')
+        self.names = bytearray()
+        self.name_offsets = array('Q', [0])
+        self.declared_count = 0
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def append_row(self, number, name, cw1, cw2, cw3, exam):
+        """
+        Add one student to the columns.
+
+        Args:
+            number (int): Student code
+            name (bytes): UTF-8 encoded name
+            cw1, cw2, cw3 (int): Coursework marks
+            exam (int): Exam mark
+        """
+        self.numbers.append(number)
+        self.coursework1.append(cw1)
+        self.coursework2.append(cw2)
+        self.coursework3.append(cw3)
+        self.exam.append(exam)
+        self.names += name
+        self.name_offsets.append(len(self.names))
+
+    def name(self, index):
+        """Return the name of the student at a row index."""
+        return self.names[self.name_offsets[index]:self.name_offsets[index + 1]].decode('utf-8')
+
+    def record(self, index):
+        """
+        Build a display record for one row (only when actually needed).
+
+        Returns:
+            tuple: (number, name, coursework_total, exam, percentage, grade)
+        """
+        coursework = self.coursework1[index] + self.coursework2[index] + self.coursework3[index]
+        percentage = (coursework + self.exam[index]) * 100 / MAX_TOTAL
+        return (self.numbers[index], self.name(index), coursework,
+                self.exam[index], percentage, grade_for(percentage))
+
+    def coursework_totals(self):
+        """Coursework total (out of 60) for every student."""
+        if np is not None:
+            return (column(self.coursework1, np.int32) + column(self.coursework2, np.int32)
+                    + column(self.coursework3, np.int32))
+        return array('i', map(sum, zip(self.coursework1, self.coursework2, self.coursework3)))
+
+    def totals(self):
+        """Overall mark (out of 160) for every student."""
+        if np is not None:
+            return self.coursework_totals() + column(self.exam, np.int32)
+        return array('i', map(int.__add__, self.coursework_totals(), self.exam))
+
+    def percentages(self):
+        """Overall percentage for every student."""
+        if np is not None:
+            return self.totals() * (100.0 / MAX_TOTAL)
+        scale = 100.0 / MAX_TOTAL
+        return array('d', (total * scale for total in self.totals()))
+
+    def grades(self):
+        """
+        Letter grade for every student.
+
+        Returns:
+            bytes: One ASCII letter per student, in row order
+        """
+        if np is not None:
+            # Index of the first bound each percentage reaches
+            bounds = np.array([bound for bound, _ in GRADE_BOUNDS[:-1]], dtype=np.float64)
+            letters = np.frombuffer(b''.join(l.encode() for _, l in GRADE_BOUNDS), dtype='S1')
+            index = np.searchsorted(-bounds, -self.percentages(), side='left')
+            return letters[index].tobytes()
+        return bytes(ord(grade_for(percentage)) for percentage in self.percentages())
+
+    def average_percentage(self):
+        """Mean overall percentage across the class (0.0 when empty)."""
+        if not len(self):
+            return 0.0
+        return sum(self.totals()) * 100.0 / (MAX_TOTAL * len(self))
+
+
+def column(values, dtype):
+    """View an array column as a NumPy array without copying."""
+    return np.frombuffer(values, dtype=values.typecode).astype(dtype, copy=False)
+
+
+def parse_row(marks, line, line_number):
+    """
+    Parse one data line into the columns.
+
+    Raises:
+        MarksFileError: If the line has the wrong shape or marks out of range
+    """
+    parts = line.split(b',')
+    if len(parts) != 6:
+        raise MarksFileError(f"line {line_number}: expected 6 fields, got {len(parts)}")
+    try:
+        number, cw1, cw2, cw3, exam = (int(parts[i]) for i in (0, 2, 3, 4, 5))
+    except ValueError:
+        raise MarksFileError(f"line {line_number}: marks must be whole numbers") from None
+    if not MIN_CODE <= number <= MAX_CODE:
+        raise MarksFileError(f"line {line_number}: student code {number} is out of range")
+    if not (0 <= cw1 <= MAX_COURSEWORK and 0 <= cw2 <= MAX_COURSEWORK
+            and 0 <= cw3 <= MAX_COURSEWORK and 0 <= exam <= MAX_EXAM):
+        raise MarksFileError(f"line {line_number}: mark out of range")
+    marks.append_row(number, parts[1].strip(), cw1, cw2, cw3, exam)
+
+
+def load_marks(path=MARKS_FILE, chunk_size=CHUNK_SIZE, strict=True):
+    """
+    Stream a marks file into a StudentMarks column store.
+
+    Args:
+        path (Path): File to read
+        chunk_size (int): Bytes read per chunk
+        strict (bool): Raise if the header count does not match the rows
+
+    Returns:
+        StudentMarks: The loaded columns
+
+    Raises:
+        MarksFileError: On a bad header, bad row or count mismatch (strict)
+    """
+    marks = StudentMarks()
+    header = None
+    line_number = 0
+    leftover = b''
+
+    with open(path, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            lines = (leftover + chunk).split(b'\n')
+            leftover = lines.pop()
+            for line in lines:
+                line_number += 1
+                line = line.strip()
+                if not line:
+                    continue
+                if header is None:
+                    header = line
+                    continue
+                parse_row(marks, line, line_number)
+        if leftover.strip():
+            line_number += 1
+            if header is None:
+                header = leftover.strip()
+            else:
+                parse_row(marks, leftover.strip(), line_number)
+
+    if header is None:
+        raise MarksFileError("file is empty")
+    try:
+        marks.declared_count = int(header)
+    except ValueError:
+        raise MarksFileError(f"first line must be the number of students, got {header[:20]!r}") from None
+    if strict and marks.declared_count != len(marks):
+        raise MarksFileError(
+            f"header says {marks.declared_count} students but the file has {len(marks)}"
+        )
+    return marks
+
+
+def save_marks(marks, path):
+    """
+    Write a column store back out in the studentMarks.txt format.
+
+    The file is written to a temporary name, synced and renamed over the
+    original, so readers only ever see the old or the new file.
+
+    Args:
+        marks (StudentMarks): Rows to write
+        path (Path): Destination file
+    """
+    path = Path(path)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, 'w', encoding='utf-8', newline='\n') as file:
+        file.write(f"{len(marks)}\n")
+        for index in range(len(marks)):
+            file.write(f"{marks.numbers[index]},{marks.name(index)},{marks.coursework1[index]},"
+                       f"{marks.coursework2[index]},{marks.coursework3[index]},{marks.exam[index]}\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def main():
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else MARKS_FILE
+    marks = load_marks(path)
+    grades = marks.grades()
+    print(f"{len(marks)} students, average {marks.average_percentage():.1f}%")
+    print("  ".join(f"{letter}: {grades.count(letter.encode())}" for _, letter in GRADE_BOUNDS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Tk / asyncio Bridge
+Runs an asyncio event loop inside the Tk mainloop, on the UI thread.
+
+The asyncio loop is stepped from root.after(). A step runs loop passes
+back to back (up to MAX_PASSES) while submitted work is outstanding, so
+a thread-pool result that needs several hops (future resolved, task
+resumed, callback delivered) reaches its callback within one step.
+After a step that delivered something the next follows in
+`busy_interval` ms; otherwise the interval doubles, up to
+`pending_interval` ms while submitted work is outstanding and
+`idle_interval` ms when none is. Outstanding work is counted per
+submit(), so plain futures from run_blocking() count as well as tasks.
+An idle window therefore costs about twenty wake-ups a second, and a
+result waits at most `pending_interval` ms after it is ready. submit()
+steps the loop straight away, so new work never waits out an idle
+interval.
+
+Coroutines run on the UI thread, so they and their callbacks may touch
+widgets directly. Blocking work (file locks, sockets, decoding) should be
+wrapped in run_blocking(), which runs it on the loop's thread pool and
+resumes the coroutine on the UI thread when it finishes.
+
+Usage:
+    bridge = TkAsyncio(root)
+    bridge.submit(fetch_scores(), callback=show_scores)
+    bridge.submit(bridge.run_blocking(exporter.flush))
+    bridge.run()            # instead of root.mainloop()
+"""
+
+import asyncio
+import functools
+import time
+
+BUSY_INTERVAL = 2
+PENDING_INTERVAL = 16
+IDLE_INTERVAL = 50
+MAX_PASSES = 8
+
+
+class TkAsyncio:
+    """
+    An asyncio event loop driven by a Tk root window.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): The loop coroutines run on
+        steps (int): How many times the loop has been stepped
+        completed (int): How many submitted tasks have finished
+        pending (int): Submitted tasks not yet delivered
+    """
+
+    def __init__(self, root, busy_interval=BUSY_INTERVAL, pending_interval=PENDING_INTERVAL,
+                 idle_interval=IDLE_INTERVAL):
+        """
+        Args:
+            root (tk.Tk): Window whose mainloop drives the asyncio loop
+            busy_interval (int): Polling period in ms right after a task finishes
+            pending_interval (int): Longest polling period in ms while tasks are pending
+            idle_interval (int): Longest polling period in ms when idle
+        """
+        self.root = root
+        self.busy_interval = busy_interval
+        self.pending_interval = pending_interval
+        self.idle_interval = idle_interval
+        self.interval = busy_interval
+        self.loop = asyncio.new_event_loop()
+        self.after_id = None
+        self.steps = 0
+        self.completed = 0
+        self.pending = 0
+        self.closed = False
+
+    def submit(self, coro, callback=None, errback=None):
+        """
+        Schedule a coroutine and deliver its outcome on the UI thread.
+
+        Args:
+            coro (coroutine or asyncio.Future): Work to run, e.g. from run_blocking()
+            callback (callable, optional): Called with the result
+            errback (callable, optional): Called with the exception (default: print it)
+
+        Returns:
+            asyncio.Future: The scheduled task (cancel() to abandon it)
+        """
+        task = asyncio.ensure_future(coro, loop=self.loop)
+        self.pending += 1
+        task.add_done_callback(functools.partial(self.deliver, callback, errback))
+        self.wake()
+        return task
+
+    def run_blocking(self, func, *args):
+        """
+        Await a blocking call without blocking the UI.
+
+        Args:
+            func (callable): Function to run on the loop's thread pool
+            *args: Arguments for func
+
+        Returns:
+            asyncio.Future: Resolves on the UI thread with func's result
+        """
+        return self.loop.run_in_executor(None, func, *args)
+
+    def deliver(self, callback, errback, task):
+        """Done-callback of submitted tasks; runs on the UI thread."""
+        self.completed += 1
+        self.pending -= 1
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            if errback is not None:
+                errback(error)
+            else:
+                print(f"Background task failed: {error!r}")
+        elif callback is not None:
+            callback(task.result())
+
+    def wake(self):
+        """Step the loop as soon as Tk is idle and return to fast polling."""
+        if self.closed:
+            return
+        self.interval = self.busy_interval
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+        self.after_id = self.root.after_idle(self.step)
+
+    def step(self):
+        """Run one iteration of the asyncio loop, then schedule the next."""
+        self.after_id = None
+        if self.closed:
+            return
+        # stop() queued behind the ready callbacks makes run_forever()
+        # process one batch of I/O and timers and return. Further passes
+        # run the callbacks that batch scheduled.
+        completed = self.completed
+        for _ in range(MAX_PASSES):
+            self.loop.call_soon(self.loop.stop)
+            self.loop.run_forever()
+            if not self.pending:
+                break
+        self.steps += 1
+
+        if self.completed != completed:
+            self.interval = self.busy_interval
+        elif self.pending:
+            self.interval = min(self.interval * 2, self.pending_interval)
+        else:
+            self.interval = min(self.interval * 2, self.idle_interval)
+        self.after_id = self.root.after(self.interval, self.step)
+
+    def drain(self, timeout=5.0):
+        """
+        Run the loop until everything submitted has been delivered.
+
+        For callers that drive the window themselves (session replay,
+        scripts) and need background work finished before the next step.
+
+        Returns:
+            bool: False if work was still pending after `timeout` seconds
+        """
+        deadline = time.monotonic() + timeout
+        while self.pending and not self.closed and time.monotonic() < deadline:
+            # Sleeping in the loop lets thread-pool results wake it up
+            self.loop.run_until_complete(asyncio.sleep(0.001))
+        return not self.pending
+
+    def run(self):
+        """Run the Tk mainloop with the asyncio loop attached, then close it."""
+        self.wake()
+        try:
+            self.root.mainloop()
+        finally:
+            self.close()
+
+    def close(self):
+        """Cancel outstanding tasks and shut the loop and thread pool down."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except Exception:
+                pass  # window already destroyed
+            self.after_id = None
+
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.run_until_complete(self.loop.shutdown_default_executor())
+        self.loop.close()